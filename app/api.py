@@ -0,0 +1,293 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import AsyncIterator
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from app.services import metrics, scraper
+from app.services.breaker import STATES, UpstreamUnavailable, breakers
+from app.services.feed import latest_feed
+from app.services.http_pool import pool
+from app.services.scheduler import resolution_scheduler
+from app.services.search_index import search_index
+from app.services.timeouts import adaptive_timeouts
+
+
+def _service_families() -> list[metrics.Family]:
+    """Report cache, pool, coalescing, scheduler, breaker and timeout state as metrics."""
+    caches = {
+        scraper.direct_link_cache.name: scraper.direct_link_cache.stats(),
+        scraper.link_groups_cache.name: scraper.link_groups_cache.stats(),
+    }
+    pools = pool.stats()
+    flights = scraper.coalescing_stats()
+    scheduler = resolution_scheduler.stats()
+    index = search_index.stats()
+    circuits = breakers.states()
+    budgets = adaptive_timeouts.budgets()
+    return [
+        (
+            "scraper_cache_entries",
+            "gauge",
+            "Entries held in each cache.",
+            [({"cache": name}, s["entries"]) for name, s in caches.items()],
+        ),
+        (
+            "scraper_cache_lookups_total",
+            "counter",
+            "Cache lookups by result.",
+            [
+                ({"cache": name, "result": result}, s[key])
+                for name, s in caches.items()
+                for result, key in (
+                    ("hit", "hits"),
+                    ("stale", "stale_hits"),
+                    ("miss", "misses"),
+                )
+                if key in s
+            ],
+        ),
+        (
+            "scraper_pool_requests_total",
+            "counter",
+            "Pooled requests per host by whether an idle connection was reused.",
+            [
+                ({"host": host, "result": result}, s[key])
+                for host, s in pools.items()
+                for result, key in (("hit", "hits"), ("miss", "misses"))
+            ],
+        ),
+        (
+            "scraper_pool_connections",
+            "gauge",
+            "Open connections per host.",
+            [({"host": host}, s["connections"]) for host, s in pools.items()],
+        ),
+        (
+            "scraper_singleflight_calls_total",
+            "counter",
+            "Single-flight calls by whether they ran or joined an in-flight call.",
+            [
+                ({"flight": name, "result": result}, s[result])
+                for name, s in flights.items()
+                for result in ("executions", "coalesced")
+            ],
+        ),
+        (
+            "scraper_singleflight_inflight",
+            "gauge",
+            "Calls currently in flight per single-flight group.",
+            [({"flight": name}, s["inflight"]) for name, s in flights.items()],
+        ),
+        (
+            "scraper_scheduler_queued",
+            "gauge",
+            "Link resolutions waiting for a slot.",
+            [({}, scheduler["queued"])],
+        ),
+        (
+            "scraper_scheduler_running",
+            "gauge",
+            "Link resolutions currently running.",
+            [({}, scheduler["running"])],
+        ),
+        (
+            "scraper_scheduler_max_wait_seconds",
+            "gauge",
+            "Longest queueing delay seen by a link resolution.",
+            [({}, scheduler["max_wait"])],
+        ),
+        (
+            "scraper_breaker_state",
+            "gauge",
+            "Circuit breaker state per upstream host (1 for the current state).",
+            [
+                ({"host": host, "state": name}, int(state == name))
+                for host, state in circuits.items()
+                for name in STATES
+            ],
+        ),
+        (
+            "scraper_timeout_seconds",
+            "gauge",
+            "Current adaptive connect/read timeout per upstream host.",
+            [
+                ({"host": host, "phase": phase}, value)
+                for host, b in budgets.items()
+                for phase, value in b.items()
+            ],
+        ),
+        (
+            "scraper_search_index_entries",
+            "gauge",
+            "Movies held in the local search index.",
+            [({}, index["entries"])],
+        ),
+        (
+            "scraper_search_index_lookups_total",
+            "counter",
+            "Local search index lookups by result.",
+            [({"result": "hit"}, index["hits"]), ({"result": "miss"}, index["misses"])],
+        ),
+        (
+            "scraper_latest_feed_age_seconds",
+            "gauge",
+            "Seconds since the latest-movies snapshot was refreshed.",
+            [
+                (
+                    {},
+                    time.time() - latest_feed.refreshed_at
+                    if latest_feed.refreshed_at
+                    else -1,
+                )
+            ],
+        ),
+    ]
+
+
+metrics.registry.register_collector(_service_families)
+
+
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def _bad_request(message: str) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=400)
+
+
+def _unavailable(error: UpstreamUnavailable) -> JSONResponse:
+    return JSONResponse(
+        {"error": str(error), "host": error.host},
+        status_code=503,
+        headers={"Retry-After": str(max(1, round(error.retry_in)))},
+    )
+
+
+def _link_items(groups: list[dict]) -> list[dict[str, str]]:
+    """Flatten canonical link groups into one item per link."""
+    return [
+        {
+            "group": group["title"],
+            "priority": g_idx,
+            "label": link["label"] or link["type"] or "Link",
+            "type": link["type"],
+            "url": link["url"],
+        }
+        for g_idx, group in enumerate(groups)
+        for link in group["links"]
+    ]
+
+
+async def search_endpoint(request: Request) -> JSONResponse:
+    query = request.query_params.get("q", "").strip()
+    if not query:
+        return _bad_request("missing query parameter 'q'")
+    return JSONResponse({"query": query, "results": await scraper.search_movie(query)})
+
+
+async def latest_endpoint(request: Request) -> JSONResponse:
+    return JSONResponse({"results": await latest_feed.get()})
+
+
+async def links_endpoint(request: Request) -> JSONResponse:
+    url = request.query_params.get("url", "")
+    if not url:
+        return _bad_request("missing query parameter 'url'")
+    refresh = request.query_params.get("refresh") == "1"
+    try:
+        groups = await scraper.get_download_links(url, refresh)
+    except UpstreamUnavailable as e:
+        return _unavailable(e)
+    return JSONResponse({"url": url, "groups": groups, "items": _link_items(groups)})
+
+
+async def resolve_endpoint(request: Request) -> JSONResponse:
+    url = request.query_params.get("url", "")
+    if not url:
+        return _bad_request("missing query parameter 'url'")
+    try:
+        direct = await scraper.scheduled_direct_link(url)
+    except UpstreamUnavailable as e:
+        return _unavailable(e)
+    ok = direct.startswith("http")
+    return JSONResponse({"url": url, "direct": direct if ok else "", "ok": ok})
+
+
+async def _resolved_items(items: list[dict[str, str]], tag: str) -> AsyncIterator[dict]:
+    async def resolve(item: dict[str, str]) -> dict:
+        try:
+            direct = await scraper.scheduled_direct_link(
+                item["url"], item.get("priority", 0), tag
+            )
+        except UpstreamUnavailable as e:
+            return {**item, "direct": "", "ok": False, "error": str(e)}
+        ok = direct.startswith("http")
+        return {**item, "direct": direct if ok else "", "ok": ok}
+
+    tasks = [asyncio.ensure_future(resolve(item)) for item in items]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def resolve_stream_endpoint(request: Request) -> StreamingResponse:
+    """Resolve every link of ``movie`` (or each ``url``), streaming items as they finish.
+
+    Responds with server-sent events when the client accepts
+    ``text/event-stream`` or passes ``format=sse``, and NDJSON otherwise.
+    """
+    movie = request.query_params.get("movie", "")
+    if movie:
+        try:
+            items = _link_items(await scraper.get_download_links(movie))
+        except UpstreamUnavailable as e:
+            return _unavailable(e)
+    else:
+        items = [
+            {"group": "", "label": "", "url": url}
+            for url in request.query_params.getlist("url")
+        ]
+        if not items:
+            return _bad_request("missing query parameter 'movie' or 'url'")
+    sse = request.query_params.get("format") == "sse" or (
+        "text/event-stream" in request.headers.get("accept", "")
+    )
+
+    def encode(event: str, record: dict) -> str:
+        if sse:
+            return f"event: {event}\ndata: {json.dumps(record)}\n\n"
+        return json.dumps(record) + "\n"
+
+    async def body() -> AsyncIterator[str]:
+        resolved = 0
+        async for record in _resolved_items(items, f"api-{uuid.uuid4().hex}:{movie}"):
+            resolved += record["ok"]
+            yield encode("link", record)
+        yield encode("done", {"done": True, "total": len(items), "resolved": resolved})
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+api = Starlette(
+    routes=[
+        Route("/metrics", metrics_endpoint),
+        Route("/api/search", search_endpoint),
+        Route("/api/latest", latest_endpoint),
+        Route("/api/links", links_endpoint),
+        Route("/api/resolve", resolve_endpoint),
+        Route("/api/resolve/stream", resolve_stream_endpoint),
+    ]
+)
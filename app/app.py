@@ -2,6 +2,11 @@ import reflex as rx
 from app.states.movie_state import MovieState
 from app.components.navbar import navbar
 from app.components.movie_card import movie_card
+from app.api import api
+from app.services.crawler import crawler
+from app.services.feed import latest_feed
+from app.services.fuzzy import title_index
+from app.services.prefetch import prefetcher
 
 
 def manual_fetch_section() -> rx.Component:
@@ -97,5 +102,10 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=api,
 )
-app.add_page(index, route="/", on_load=MovieState.on_load)
\ No newline at end of file
+app.add_page(index, route="/", on_load=MovieState.on_load)
+app.register_lifespan_task(latest_feed.run)
+app.register_lifespan_task(prefetcher.run)
+app.register_lifespan_task(crawler.run)
+app.register_lifespan_task(title_index.load)
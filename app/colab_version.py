@@ -3,13 +3,32 @@ import re
 import ast
 import json
 import logging
+import os
+import sqlite3
+import sys
+import threading
 import time
-from bs4 import BeautifulSoup
+import argparse
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import redirect_stdout
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urlparse
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 TIMEOUT = 10
+CACHE_DB_PATH = os.getenv("SCRAPER_CACHE_DB", "")
+DIRECT_LINK_CACHE_SIZE = 5000
+DIRECT_LINK_CACHE_TTL = 6 * 60 * 60
+try:
+    import lxml  # noqa: F401
+
+    PARSER = os.getenv("SCRAPER_HTML_PARSER", "lxml")
+except ImportError:
+    PARSER = os.getenv("SCRAPER_HTML_PARSER", "html.parser")
+MOVIE_ITEMS = SoupStrainer("article", class_=re.compile("(^|\\s)item(\\s|$)"))
+HIDDEN_INPUTS = SoupStrainer("input", attrs={"type": "hidden"})
 COOKIES = {
     "starstruck_c64520dd9f1cfb797aa415c1816a487c": "17056c72fb574b1051c60a2706bd4d07",
     "cf_clearance": "NunVbXqcDNvo09Xs5c63zOt0K4K4GclzRsLXDDQWv2E-1745647886-1.2.1.1-gVDTFu3OhRXXm0YTtWRHth_XWJEZcuXSItfxvnWqfBUm4kG9FI5HJOWEeIDBZ2_Ob8q4x.VwB_oxJh59ut_FQUSZio1Y4sBh5WHjtxsVL0c2yftAU5lVqEGQKStDNj8i.pQG3aZ4bcAdakso5XXHTeuV2ZIPhUsm8xbVKPRyVZkM4.3paqJeCDY7EoDxHA_8gg2h7Cc.anyPtfN0JuX9Mvs6gg7SYP5fMVL02XyinNpmdfOOWAxIswRtLmih6o_Kbr4vU.oz4DdeL9p0fg2gP8RNLwtoQeDT7k4RCcP45pTkRWei1P4yfOoBJf5RGMdoqaeEgh5RVptJlvO32RifsIJ4MMatkc35b_UVwVa91so",
@@ -37,9 +56,68 @@ session.headers.update(HEADERS)
 session.cookies.update(COOKIES)
 
 
+class DirectLinkCache:
+    """LRU cache of resolved direct links with TTL and optional SQLite persistence."""
+
+    def __init__(self, max_entries: int, ttl: float, db_path: str = ""):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = None
+        if db_path:
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS direct_links (url TEXT PRIMARY KEY, direct TEXT, expires REAL)"
+            )
+            self.db.commit()
+
+    def get(self, url: str):
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None and self.db is not None:
+                entry = self.db.execute(
+                    "SELECT expires, direct FROM direct_links WHERE url = ?", (url,)
+                ).fetchone()
+            if entry and entry[0] > now:
+                self.entries[url] = entry
+                self.entries.move_to_end(url)
+                self.hits += 1
+                return entry[1]
+            self.entries.pop(url, None)
+            self.misses += 1
+            return None
+
+    def set(self, url: str, direct: str):
+        expires = time.time() + self.ttl
+        with self.lock:
+            self.entries[url] = (expires, direct)
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO direct_links (url, direct, expires) VALUES (?, ?, ?)",
+                    (url, direct, expires),
+                )
+                self.db.commit()
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+direct_link_cache = DirectLinkCache(
+    DIRECT_LINK_CACHE_SIZE, DIRECT_LINK_CACHE_TTL, CACHE_DB_PATH
+)
+
+
 def extract_all_links(html: str) -> list[dict]:
     """Extract download links from HTML content using multiple strategies."""
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, PARSER)
     results = []
     for tag in soup.find_all(["h2", "p", "strong", "em", "span"]):
         text = tag.get_text(strip=True)
@@ -93,6 +171,39 @@ def extract_all_links(html: str) -> list[dict]:
     return results
 
 
+def parse_movie_items(html: str) -> list[dict[str, str]]:
+    """Movie cards of a listing page, parsed with the MOVIE_ITEMS strainer."""
+    soup = BeautifulSoup(html, PARSER, parse_only=MOVIE_ITEMS)
+    results = []
+    for item in soup.find_all("article", class_="item"):
+        a_tag = item.find("a", href=True)
+        img_tag = item.find("img", src=True)
+        title = "Unknown Title"
+        title_elem = item.find(["h2", "h3"])
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+        elif a_tag and a_tag.get_text(strip=True):
+            title = a_tag.get_text(strip=True)
+        elif img_tag and img_tag.get("alt"):
+            title = img_tag["alt"]
+        link = a_tag["href"] if a_tag else ""
+        image = img_tag["src"] if img_tag else ""
+        if link:
+            results.append({"title": title, "image": image, "link": link})
+    return results
+
+
+def hidden_inputs(html: str, *names: str) -> dict[str, str]:
+    """Values of the named hidden inputs, parsed with the HIDDEN_INPUTS strainer."""
+    soup = BeautifulSoup(html, PARSER, parse_only=HIDDEN_INPUTS)
+    found = {}
+    for name in names:
+        tag = soup.find("input", {"type": "hidden", "name": name})
+        if tag:
+            found[name] = tag["value"]
+    return found
+
+
 def search_movie(query: str) -> list[dict[str, str]]:
     """Search for movies on fojik.com."""
     try:
@@ -100,25 +211,7 @@ def search_movie(query: str) -> list[dict[str, str]]:
         print(f"Searching for '{query}'...")
         resp = session.get("https://fojik.com/", params=params, timeout=TIMEOUT)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        items = soup.find_all("article", class_="item")
-        results = []
-        for item in items:
-            a_tag = item.find("a", href=True)
-            img_tag = item.find("img", src=True)
-            title = "Unknown Title"
-            title_elem = item.find(["h2", "h3"])
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-            elif a_tag and a_tag.get_text(strip=True):
-                title = a_tag.get_text(strip=True)
-            elif img_tag and img_tag.get("alt"):
-                title = img_tag["alt"]
-            link = a_tag["href"] if a_tag else ""
-            image = img_tag["src"] if img_tag else ""
-            if link:
-                results.append({"title": title, "image": image, "link": link})
-        return results
+        return parse_movie_items(resp.text)
     except Exception as e:
         logging.exception(f"Error searching movie '{query}': {e}")
         return []
@@ -130,25 +223,7 @@ def get_latest_movies() -> list[dict[str, str]]:
         print("Fetching latest releases...")
         resp = session.get("https://fojik.com/", timeout=TIMEOUT)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        items = soup.find_all("article", class_="item")
-        results = []
-        for item in items:
-            a_tag = item.find("a", href=True)
-            img_tag = item.find("img", src=True)
-            title = "Unknown Title"
-            title_elem = item.find(["h2", "h3"])
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-            elif a_tag and a_tag.get_text(strip=True):
-                title = a_tag.get_text(strip=True)
-            elif img_tag and img_tag.get("alt"):
-                title = img_tag["alt"]
-            link = a_tag["href"] if a_tag else ""
-            image = img_tag["src"] if img_tag else ""
-            if link:
-                results.append({"title": title, "image": image, "link": link})
-        return results[:10]
+        return parse_movie_items(resp.text)[:10]
     except Exception as e:
         logging.exception(f"Error fetching latest movies: {e}")
         return []
@@ -162,25 +237,22 @@ def get_download_links(url: str) -> list[dict]:
         print(f"Fetching download page: {url}...")
         response = local_session.get(url, timeout=TIMEOUT)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        fu_input = soup.find("input", {"type": "hidden", "name": "FU"})
-        fn_input = soup.find("input", {"type": "hidden", "name": "FN"})
-        if not fu_input or not fn_input:
+        tokens = hidden_inputs(response.text, "FU", "FN")
+        if "FU" not in tokens or "FN" not in tokens:
             print(f"Could not find hidden inputs FU/FN on {url}")
             return []
         response = local_session.post(
             "https://search.technews24.site/blog.php",
-            data={"FU": fu_input["value"], "FN": fn_input["value"]},
+            data=tokens,
             timeout=TIMEOUT,
         )
-        soup = BeautifulSoup(response.text, "html.parser")
-        fu2_input = soup.find("input", {"type": "hidden", "name": "FU2"})
-        if not fu2_input:
+        tokens = hidden_inputs(response.text, "FU2")
+        if "FU2" not in tokens:
             print("Could not find hidden input FU2")
             return []
         response = local_session.post(
             "https://freethemesy.com/dld.php",
-            data={"FU2": fu2_input["value"]},
+            data=tokens,
             timeout=TIMEOUT,
         )
         ss_match = re.search("var sss = '(.*?)'; var", response.text)
@@ -204,7 +276,6 @@ def get_download_links(url: str) -> list[dict]:
             final_url, data=payload, headers=headers, timeout=TIMEOUT
         ).text.strip()
         response = local_session.get(final_response_down_page, timeout=TIMEOUT)
-        soup = BeautifulSoup(response.text, "html.parser")
         links = extract_all_links(response.text)
         filtered_links = []
         if isinstance(links, list):
@@ -230,28 +301,34 @@ def get_download_links(url: str) -> list[dict]:
 
 def get_direct_link(url: str) -> str:
     """Extract direct download link from the intermediate link."""
+    cached = direct_link_cache.get(url)
+    if cached is not None:
+        return cached
+    direct = resolve_direct_link(url)
+    if direct.startswith("http"):
+        direct_link_cache.set(url, direct)
+    return direct
+
+
+def resolve_direct_link(url: str) -> str:
     try:
         local_session = requests.Session()
         local_session.headers.update(DEFAULT_HEADERS)
         response = local_session.get(url, timeout=TIMEOUT)
-        fu5_input = BeautifulSoup(response.text, "html.parser").find(
-            "input", {"type": "hidden", "name": "FU5"}
-        )
-        if not fu5_input:
+        tokens = hidden_inputs(response.text, "FU5")
+        if "FU5" not in tokens:
             return ""
         response = local_session.post(
             "https://sharelink-3.site/dld.php",
-            data={"FU5": fu5_input["value"]},
+            data=tokens,
             timeout=TIMEOUT,
         )
-        fu7_input = BeautifulSoup(response.text, "html.parser").find(
-            "input", {"type": "hidden", "name": "FU7"}
-        )
-        if not fu7_input:
+        tokens = hidden_inputs(response.text, "FU7")
+        if "FU7" not in tokens:
             return ""
         response = local_session.post(
             "https://sharelink-3.site/blog/",
-            data={"FU7": fu7_input["value"]},
+            data=tokens,
             timeout=TIMEOUT,
         )
         ss_match = re.search("var sss = '(.*?)';", response.text)
@@ -353,6 +430,7 @@ Select movie number to fetch links (0 to cancel): """)
                             else:
                                 print("Failed.")
                                 print(f"   -> Original: {url}")
+            print(f"Direct link cache hit rate: {direct_link_cache.hit_rate():.0%}")
             print_separator()
             input("Press Enter to continue...")
         except ValueError as e:
@@ -362,5 +440,156 @@ Select movie number to fetch links (0 to cancel): """)
             break
 
 
+def batch_movies(line: str, per_query: int) -> list[dict[str, str]]:
+    """Movies for one batch input line: a movie/episode URL or a search query."""
+    if line.startswith("http"):
+        return [{"title": line, "link": line, "image": ""}]
+    return search_movie(line)[:per_query]
+
+
+def link_items(link_groups: list[dict]):
+    for group in link_groups:
+        group_name = group.get("group") or group.get("title") or "Links"
+        items = group.get("items", []) or group.get("links", []) or [group]
+        for item in items:
+            url = item.get("url") or item.get("link")
+            if url:
+                label = item.get("label") or item.get("type") or "Link"
+                yield group_name, label, url
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    return fn(*args), time.perf_counter() - started
+
+
+def run_batch(lines: list[str], workers: int, per_query: int, out) -> dict:
+    """Resolve every input line on a thread pool, writing one JSON record per link.
+
+    Inputs are searched, movies are expanded into link groups and each link is
+    resolved concurrently; records are written as soon as they complete.
+    """
+    started = time.perf_counter()
+    summary = {"inputs": len(lines), "movies": 0, "links": 0, "resolved": 0}
+    latencies = []
+
+    def emit(record: dict):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {
+            pool.submit(batch_movies, line, per_query): ("input", line, None)
+            for line in lines
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, line, context = pending.pop(future)
+                if kind == "input":
+                    movies = future.result()
+                    if not movies:
+                        emit({"input": line, "error": "no_movies"})
+                    for movie in movies:
+                        summary["movies"] += 1
+                        task = pool.submit(timed, get_download_links, movie["link"])
+                        pending[task] = ("movie", line, movie)
+                elif kind == "movie":
+                    link_groups, _ = future.result()
+                    items = list(link_items(link_groups))
+                    if not items:
+                        emit(
+                            {
+                                "input": line,
+                                "movie": context["link"],
+                                "error": "no_links",
+                            }
+                        )
+                    for group_name, label, url in items:
+                        summary["links"] += 1
+                        task = pool.submit(timed, get_direct_link, url)
+                        pending[task] = (
+                            "link",
+                            line,
+                            (context, group_name, label, url),
+                        )
+                else:
+                    direct, seconds = future.result()
+                    movie, group_name, label, url = context
+                    ok = direct.startswith("http")
+                    summary["resolved"] += ok
+                    latencies.append(seconds)
+                    emit(
+                        {
+                            "input": line,
+                            "movie": movie["link"],
+                            "title": movie["title"],
+                            "group": group_name,
+                            "label": label,
+                            "url": url,
+                            "direct": direct if ok else "",
+                            "ok": ok,
+                            "seconds": round(seconds, 3),
+                        }
+                    )
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    summary.update(
+        {
+            "failed": summary["links"] - summary["resolved"],
+            "elapsed": round(elapsed, 2),
+            "links_per_second": round(summary["links"] / elapsed, 2) if elapsed else 0,
+            "p50": round(latencies[len(latencies) // 2], 3) if latencies else 0,
+            "p95": round(latencies[int(len(latencies) * 0.95)], 3) if latencies else 0,
+            "max": round(latencies[-1], 3) if latencies else 0,
+            "cache_hit_rate": round(direct_link_cache.hit_rate(), 3),
+        }
+    )
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Movie scraper (Colab version)")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="resolve the movie URLs or search queries in FILE ('-' for stdin), one per line, and print JSONL",
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--per-query",
+        type=int,
+        default=1,
+        help="search results to resolve for each query line",
+    )
+    # Notebook kernels pass their own arguments; ignore anything unknown.
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def batch_main(args):
+    source = sys.stdin if args.batch == "-" else open(args.batch)
+    with source:
+        lines = [
+            line.strip() for line in source if line.strip() and not line.startswith("#")
+        ]
+    out = sys.stdout
+    # Progress messages go to stderr so stdout stays valid JSONL.
+    with redirect_stdout(sys.stderr):
+        summary = run_batch(lines, args.workers, args.per_query, out)
+    print(
+        f"{summary['links']} links from {summary['movies']} movies in "
+        f"{summary['elapsed']}s ({summary['links_per_second']} links/s): "
+        f"{summary['resolved']} resolved, {summary['failed']} failed; latency "
+        f"p50 {summary['p50']}s p95 {summary['p95']}s max {summary['max']}s; "
+        f"cache hit rate {summary['cache_hit_rate']:.0%}",
+        file=sys.stderr,
+    )
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.batch:
+        batch_main(args)
+    else:
+        main()
@@ -36,24 +36,41 @@ def link_item_row(item: LinkItem) -> rx.Component:
         ),
         rx.el.div(
             rx.cond(
-                item["resolving"],
-                rx.el.div(
-                    rx.spinner(size="1", color="red"),
-                    rx.el.span("Resolving...", class_name="ml-2 text-xs text-gray-500"),
-                    class_name="flex items-center px-3 py-1.5 bg-gray-50 rounded-md border border-gray-100",
-                ),
+                MovieState.direct_urls.contains(item["url"]),
                 rx.cond(
-                    item["direct_url"],
+                    MovieState.direct_urls[item["url"]],
                     rx.el.button(
                         rx.icon("copy", size=16, class_name="mr-2"),
                         rx.el.span("Copy Direct Link"),
-                        on_click=MovieState.copy_text(item["direct_url"]),
+                        on_click=MovieState.copy_text(
+                            MovieState.direct_urls[item["url"]]
+                        ),
                         class_name="flex items-center px-4 py-2 text-xs font-bold rounded-md border border-transparent bg-green-600 text-white hover:bg-green-700 transition-all shadow-sm hover:shadow focus:ring-2 focus:ring-green-500 focus:ring-offset-1",
                     ),
                     action_button(
                         "link", "Copy Link", MovieState.copy_text(item["url"])
                     ),
                 ),
+                rx.cond(
+                    MovieState.lazy_resolution
+                    & ~MovieState.resolving.contains(item["url"]),
+                    rx.el.div(
+                        action_button(
+                            "zap", "Resolve", MovieState.resolve_link(item["url"])
+                        ),
+                        action_button(
+                            "link", "Copy Link", MovieState.copy_text(item["url"])
+                        ),
+                        class_name="flex items-center gap-2",
+                    ),
+                    rx.el.div(
+                        rx.spinner(size="1", color="red"),
+                        rx.el.span(
+                            "Resolving...", class_name="ml-2 text-xs text-gray-500"
+                        ),
+                        class_name="flex items-center px-3 py-1.5 bg-gray-50 rounded-md border border-gray-100",
+                    ),
+                ),
             ),
             class_name="flex items-center",
         ),
@@ -61,18 +78,55 @@ def link_item_row(item: LinkItem) -> rx.Component:
     )
 
 
-def link_group(group: LinkGroup) -> rx.Component:
+def upstream_unavailable_notice() -> rx.Component:
+    return rx.el.div(
+        rx.icon("cloud-off", size=18, class_name="text-amber-600 mr-2 shrink-0"),
+        rx.el.div(
+            rx.el.p(
+                "Upstream unavailable",
+                class_name="text-sm font-semibold text-amber-800",
+            ),
+            rx.el.p(
+                MovieState.upstream_unavailable,
+                class_name="text-xs text-amber-700",
+            ),
+        ),
+        class_name="flex items-start p-3 m-4 mb-0 rounded-md bg-amber-50 border border-amber-200",
+    )
+
+
+def link_group(group: LinkGroup, index: rx.Var[int]) -> rx.Component:
+    is_open = ~MovieState.lazy_resolution | MovieState.open_groups.contains(index)
     return rx.el.div(
         rx.el.h4(
+            rx.cond(
+                MovieState.lazy_resolution,
+                rx.icon(
+                    rx.cond(is_open, "chevron-down", "chevron-right"),
+                    size=14,
+                    class_name="mr-1",
+                ),
+            ),
             group["group"],
-            class_name="text-xs font-bold text-red-600 uppercase tracking-wider mb-2 flex items-center pt-2 border-t border-gray-100 mt-2 first:mt-0 first:border-t-0 first:pt-0",
+            on_click=MovieState.toggle_group(index),
+            class_name=rx.cond(
+                MovieState.lazy_resolution,
+                "text-xs font-bold text-red-600 uppercase tracking-wider mb-2 flex items-center pt-2 border-t border-gray-100 mt-2 first:mt-0 first:border-t-0 first:pt-0 cursor-pointer select-none",
+                "text-xs font-bold text-red-600 uppercase tracking-wider mb-2 flex items-center pt-2 border-t border-gray-100 mt-2 first:mt-0 first:border-t-0 first:pt-0",
+            ),
+        ),
+        rx.cond(
+            is_open,
+            rx.el.div(
+                rx.foreach(group["items"], link_item_row), class_name="space-y-2"
+            ),
         ),
-        rx.el.div(rx.foreach(group["items"], link_item_row), class_name="space-y-2"),
         class_name="mb-4 last:mb-0",
     )
 
 
 def movie_card(movie: Movie) -> rx.Component:
+    expanded = MovieState.expanded_link == movie["link"]
     return rx.el.div(
         rx.el.div(
             rx.image(
@@ -82,7 +136,7 @@ def movie_card(movie: Movie) -> rx.Component:
                 loading="lazy",
             ),
             rx.cond(
-                movie["expanded"],
+                expanded,
                 rx.el.div(
                     rx.icon(
                         "chevron-up", size=24, class_name="text-white drop-shadow-md"
@@ -108,10 +162,10 @@ def movie_card(movie: Movie) -> rx.Component:
             on_click=lambda: MovieState.toggle_movie_expand(movie["link"]),
         ),
         rx.cond(
-            movie["expanded"],
+            expanded,
             rx.el.div(
                 rx.cond(
-                    movie["loading_links"],
+                    MovieState.loading_links,
                     rx.el.div(
                         rx.spinner(size="2", color="red"),
                         rx.el.p(
@@ -120,18 +174,40 @@ def movie_card(movie: Movie) -> rx.Component:
                         ),
                         class_name="flex flex-col items-center justify-center py-8 bg-gray-50/30",
                     ),
-                    rx.cond(
-                        movie["links"].length() > 0,
-                        rx.el.div(
-                            rx.foreach(movie["links"], link_group),
-                            class_name="p-4 bg-white space-y-1 max-h-[400px] overflow-y-auto custom-scrollbar border-t border-gray-100",
+                    rx.el.div(
+                        rx.cond(
+                            MovieState.upstream_unavailable != "",
+                            upstream_unavailable_notice(),
+                        ),
+                        rx.cond(
+                            MovieState.link_groups.length() > 0,
+                            rx.el.div(
+                                rx.foreach(MovieState.link_groups, link_group),
+                                class_name="p-4 bg-white space-y-1 max-h-[400px] overflow-y-auto custom-scrollbar border-t border-gray-100",
+                            ),
+                            rx.cond(
+                                MovieState.upstream_unavailable == "",
+                                rx.el.div(
+                                    rx.icon(
+                                        "file-x",
+                                        size=24,
+                                        class_name="text-gray-300 mb-2",
+                                    ),
+                                    rx.el.p(
+                                        "No links found",
+                                        class_name="text-xs text-gray-400",
+                                    ),
+                                    class_name="flex flex-col items-center justify-center py-8 bg-gray-50/50",
+                                ),
+                            ),
                         ),
                         rx.el.div(
-                            rx.icon("file-x", size=24, class_name="text-gray-300 mb-2"),
-                            rx.el.p(
-                                "No links found", class_name="text-xs text-gray-400"
+                            action_button(
+                                "refresh-cw",
+                                "Refresh Links",
+                                MovieState.refresh_links(movie["link"]),
                             ),
-                            class_name="flex flex-col items-center justify-center py-8 bg-gray-50/50",
+                            class_name="flex justify-end px-4 py-2 bg-gray-50/50 border-t border-gray-100",
                         ),
                     ),
                 ),
@@ -139,4 +215,4 @@ def movie_card(movie: Movie) -> rx.Component:
             ),
         ),
         class_name="group flex flex-col rounded-lg overflow-hidden bg-white shadow-sm hover:shadow-md transition-all duration-300 border border-gray-200",
-    )
\ No newline at end of file
+    )
@@ -1,5 +1,21 @@
 import reflex as rx
-from app.states.movie_state import MovieState
+from app.states.movie_state import Movie, MovieState
+
+
+def suggestion_item(movie: Movie) -> rx.Component:
+    return rx.el.li(
+        rx.image(
+            src=movie["image"],
+            alt=movie["title"],
+            class_name="w-8 h-12 object-cover rounded flex-shrink-0",
+            loading="lazy",
+        ),
+        rx.el.span(
+            movie["title"], class_name="ml-3 text-sm text-gray-800 line-clamp-2"
+        ),
+        on_click=MovieState.select_suggestion(movie["link"]),
+        class_name="flex items-center px-3 py-2 cursor-pointer hover:bg-red-50 transition-colors",
+    )
 
 
 def navbar() -> rx.Component:
@@ -23,6 +39,13 @@ def navbar() -> rx.Component:
                         class_name="w-full pl-10 pr-4 py-2 bg-white rounded-full text-gray-900 placeholder-gray-500 focus:outline-none focus:ring-2 focus:ring-white/50 font-['JetBrains_Mono'] text-sm shadow-sm transition-all",
                         default_value=MovieState.search_query,
                     ),
+                    rx.cond(
+                        MovieState.suggestions.length() > 0,
+                        rx.el.ul(
+                            rx.foreach(MovieState.suggestions, suggestion_item),
+                            class_name="absolute left-0 right-0 top-full mt-2 bg-white rounded-lg shadow-lg border border-gray-200 overflow-hidden z-50",
+                        ),
+                    ),
                     class_name="relative w-full max-w-md",
                 ),
                 rx.el.button(
@@ -0,0 +1,37 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+async def completed_batches(
+    aws: Iterable[Awaitable[T]], interval: float, max_items: int
+) -> AsyncIterator[list[T]]:
+    """Yield results of ``aws`` as they complete, grouped into batches.
+
+    A batch is yielded ``interval`` seconds after its first result arrived or
+    as soon as it holds ``max_items`` results, whichever comes first; whatever
+    remains is flushed once everything has completed.
+    """
+    loop = asyncio.get_running_loop()
+    pending = {asyncio.ensure_future(aw) for aw in aws}
+    batch: list[T] = []
+    deadline = None
+    try:
+        while pending:
+            timeout = None if deadline is None else max(0, deadline - loop.time())
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            batch.extend(task.result() for task in done)
+            if batch and deadline is None:
+                deadline = loop.time() + interval
+            if batch and (
+                not pending or len(batch) >= max_items or loop.time() >= deadline
+            ):
+                yield batch
+                batch = []
+                deadline = None
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,139 @@
+import logging
+import time
+from collections import deque
+from app.services import config, metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATES = (CLOSED, HALF_OPEN, OPEN)
+
+breaker_transitions = metrics.registry.counter(
+    "scraper_breaker_transitions_total", "Circuit breaker state changes per host."
+)
+breaker_rejections = metrics.registry.counter(
+    "scraper_breaker_rejections_total", "Hops failed fast by an open circuit."
+)
+
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of contacting a host whose circuit is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} is unavailable, retrying in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit for one upstream host.
+
+    The circuit opens once at least ``failure_threshold`` of the last
+    ``window`` calls failed (after ``min_requests`` calls). While open every
+    call is rejected for ``open_seconds``; then up to ``probes`` calls are let
+    through, and the circuit closes when they all succeed or opens again on
+    the first failure.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        window: int,
+        min_requests: int,
+        failure_threshold: float,
+        open_seconds: float,
+        probes: int,
+    ):
+        self.host = host
+        self.min_requests = min_requests
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.probes = probes
+        self.state = CLOSED
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.opened_at = 0.0
+        self._probing = 0
+        self._probe_successes = 0
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        breaker_transitions.inc(host=self.host, from_state=self.state, to_state=state)
+        logging.warning(f"Circuit for {self.host} {self.state} -> {state}")
+        self.state = state
+        self.outcomes.clear()
+        self._probing = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+
+    def check(self) -> None:
+        """Raise ``UpstreamUnavailable`` while the circuit rejects calls."""
+        if self.state == OPEN:
+            remaining = self.opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                breaker_rejections.inc(host=self.host)
+                raise UpstreamUnavailable(self.host, remaining)
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN and self._probing >= self.probes:
+            breaker_rejections.inc(host=self.host)
+            raise UpstreamUnavailable(self.host, 0)
+
+    def acquire(self) -> None:
+        """Admit one call, counting it as a probe while half-open."""
+        self.check()
+        if self.state == HALF_OPEN:
+            self._probing += 1
+
+    def record(self, ok: bool | None) -> None:
+        """Report an admitted call; ``None`` releases it without a verdict."""
+        if self.state == HALF_OPEN:
+            self._probing = max(0, self._probing - 1)
+            if ok is False:
+                self._transition(OPEN)
+            elif ok:
+                self._probe_successes += 1
+                if self._probe_successes >= self.probes:
+                    self._transition(CLOSED)
+            return
+        if self.state == OPEN or ok is None:
+            return
+        self.outcomes.append(ok)
+        if (
+            len(self.outcomes) >= self.min_requests
+            and self.outcomes.count(False) / len(self.outcomes)
+            >= self.failure_threshold
+        ):
+            self._transition(OPEN)
+
+
+class BreakerRegistry:
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                host,
+                config.BREAKER_WINDOW,
+                config.BREAKER_MIN_REQUESTS,
+                config.BREAKER_FAILURE_THRESHOLD,
+                config.BREAKER_OPEN_SECONDS,
+                config.BREAKER_PROBES,
+            )
+            self._breakers[host] = breaker
+        return breaker
+
+    def check(self, *hosts: str) -> None:
+        """Fail fast when any of ``hosts`` is known to be unavailable."""
+        for host in hosts:
+            breaker = self._breakers.get(host)
+            if breaker is not None:
+                breaker.check()
+
+    def states(self) -> dict[str, str]:
+        return {host: b.state for host, b in self._breakers.items()}
+
+
+breakers = BreakerRegistry()
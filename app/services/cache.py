@@ -0,0 +1,201 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+
+class TTLCache:
+    """In-memory LRU cache with per-entry TTL and an optional SQLite backing store.
+
+    Values must be JSON serialisable when a database path is given.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl: float,
+        db_path: str = "",
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (name TEXT, key TEXT, value TEXT, expires REAL, PRIMARY KEY (name, key))"
+            )
+            self._db.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+            self._db.commit()
+
+    def get(self, key: str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires FROM cache WHERE name = ? AND key = ?",
+                    (self.name, key),
+                ).fetchone()
+                if row and row[1] > now:
+                    value = json.loads(row[0])
+                    self._store(key, row[1], value)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._store(key, expires, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (name, key, value, expires) VALUES (?, ?, ?, ?)",
+                    (self.name, key, json.dumps(value), expires),
+                )
+                self._db.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._db is not None:
+                self._db.execute(
+                    "DELETE FROM cache WHERE name = ? AND key = ?", (self.name, key)
+                )
+                self._db.commit()
+
+    def _store(self, key: str, expires: float, value: Any) -> None:
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class StaleWhileRevalidateCache:
+    """Async cache that serves stale entries immediately and refreshes them in the background.
+
+    Entries younger than ``fresh_ttl`` are returned as-is; entries younger than
+    ``stale_ttl`` are returned while a single background refresh runs. Empty
+    results are never stored, so failed fetches are retried on the next call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: int,
+        fresh_ttl: float,
+        stale_ttl: float,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    async def get(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        refresh: bool = False,
+    ) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and not refresh:
+            fetched_at, _, value = entry
+            age = time.time() - fetched_at
+            if age < self.fresh_ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            if age < self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                self._revalidate(key, fetch)
+                return value
+        self.misses += 1
+        value = await fetch()
+        self._put(key, value)
+        return value
+
+    def age(self, key: str) -> float | None:
+        """Seconds since ``key`` was fetched, or None when it is not cached."""
+        entry = self._entries.get(key)
+        return time.time() - entry[0] if entry is not None else None
+
+    def invalidate(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def _revalidate(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self.refreshes += 1
+        task = asyncio.create_task(self._refresh(key, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self._put(key, await fetch())
+        except Exception as e:
+            logging.exception(f"Background refresh of {self.name} '{key}' failed: {e}")
+
+    def _put(self, key: str, value: Any) -> None:
+        if not value:
+            return
+        size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return
+        self.invalidate(key)
+        self._entries[key] = (time.time(), size, value)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
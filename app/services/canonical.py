@@ -0,0 +1,117 @@
+import re
+from app.services import metrics
+
+QUALITY = re.compile("\\b(\\d{3,4})\\s*p\\b|\\b(4k|uhd)\\b", re.IGNORECASE)
+SIZE = re.compile("([\\d.]+)\\s*(kb|mb|gb|tb)\\b", re.IGNORECASE)
+LABEL_NOISE = re.compile("(?<!\\S)[-–—|:]+(?!\\S)|[\\[\\](){}]")
+LEADING_ZEROS = re.compile("\\b0+(\\d)")
+GROUP_KEYWORDS = ("epi", "batch", "part")
+
+canonical_links = metrics.registry.counter(
+    "scraper_canonical_links_total",
+    "Extracted links kept or dropped as duplicates before resolution.",
+)
+canonical_groups = metrics.registry.counter(
+    "scraper_canonical_groups_total",
+    "Extracted link groups kept, merged into an equal heading, or left empty.",
+)
+
+
+def normalize_label(label: str) -> str:
+    """Tidy a label in place: ``"720P (800 mb)"`` becomes ``"720p 800MB"``.
+
+    Brackets and standalone separators are dropped, quality and size tokens
+    are rewritten as ``720p``/``4K``/``UHD`` and ``800MB``; word order and
+    hyphenated words such as ``WEB-DL`` are kept.
+    """
+    text = LABEL_NOISE.sub(" ", label)
+    text = QUALITY.sub(
+        lambda m: f"{m.group(1)}p" if m.group(1) else m.group(2).upper(), text
+    )
+    text = SIZE.sub(lambda m: f"{m.group(1)}{m.group(2).upper()}", text)
+    return " ".join(text.split())
+
+
+def _group_key(title: str) -> str:
+    """Compare headings ignoring case, leading zeros and where quality/size sit."""
+    words = LEADING_ZEROS.sub("\\1", normalize_label(title).lower()).split()
+    specs = [w for w in words if QUALITY.fullmatch(w) or SIZE.fullmatch(w)]
+    return " ".join([w for w in words if w not in specs] + specs)
+
+
+def _as_groups(raw: list[dict]) -> list[dict]:
+    """Bring both extractor shapes into ``{"title", "links"}`` groups."""
+    groups = []
+    for item in raw:
+        if "links" in item:
+            links = [
+                {
+                    "label": normalize_label(sub.get("label") or sub.get("type", "")),
+                    "type": sub.get("type", ""),
+                    "url": sub.get("url") or sub.get("link", ""),
+                }
+                for sub in item["links"]
+            ]
+            groups.append(
+                {"title": normalize_label(item.get("title", "Links")), "links": links}
+            )
+        else:
+            groups.append(
+                {
+                    "title": normalize_label(item.get("quality", "Download")),
+                    "links": [
+                        {
+                            "label": item.get("type", "Link"),
+                            "type": "",
+                            "url": item.get("link") or item.get("url", ""),
+                        }
+                    ],
+                }
+            )
+    return groups
+
+
+def canonicalize(raw: list[dict]) -> list[dict]:
+    """Merge duplicate groups and keep every link URL in exactly one group.
+
+    Groups whose headings only differ in case, spacing, separators, leading
+    zeros or the position of their quality and size are merged. A URL listed
+    under several headings (an outer heading and the nested one of the same
+    block, say) is kept in the most specific of them: episode/batch/part
+    headings before generic ones, then the group with the fewest links, then
+    the earliest. Groups left without links are dropped. Titles and labels are
+    normalised with ``normalize_label``.
+    """
+    merged: dict[str, dict] = {}
+    for group in _as_groups(raw):
+        key = _group_key(group["title"])
+        if key in merged:
+            merged[key]["links"].extend(group["links"])
+            canonical_groups.inc(result="merged")
+        else:
+            merged[key] = group
+    groups = list(merged.values())
+    owner: dict[str, tuple[bool, int, int]] = {}
+    for index, group in enumerate(groups):
+        generic = not any(k in group["title"].lower() for k in GROUP_KEYWORDS)
+        urls = {link["url"] for link in group["links"] if link["url"]}
+        rank = (generic, len(urls), index)
+        for url in urls:
+            if url not in owner or rank < owner[url]:
+                owner[url] = rank
+    result = []
+    for index, group in enumerate(groups):
+        links = []
+        for link in group["links"]:
+            if owner.get(link["url"], (False, 0, -1))[2] == index:
+                links.append(link)
+                del owner[link["url"]]
+            elif link["url"]:
+                canonical_links.inc(result="duplicate")
+        canonical_links.inc(len(links), result="kept")
+        if links:
+            result.append({"title": group["title"], "links": links})
+            canonical_groups.inc(result="kept")
+        else:
+            canonical_groups.inc(result="empty")
+    return result
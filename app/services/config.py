@@ -0,0 +1,122 @@
+import os
+
+UPSTREAM_OVERRIDE = os.getenv("SCRAPER_UPSTREAM_OVERRIDE", "")
+POOL_MAX_CONNECTIONS_PER_HOST = int(os.getenv("SCRAPER_POOL_PER_HOST", "16"))
+POOL_MAX_KEEPALIVE_PER_HOST = int(os.getenv("SCRAPER_POOL_KEEPALIVE_PER_HOST", "8"))
+POOL_KEEPALIVE_EXPIRY = float(os.getenv("SCRAPER_POOL_KEEPALIVE_EXPIRY", "30"))
+POOL_HOST_LIMITS = {
+    "fojik.com": int(os.getenv("SCRAPER_POOL_FOJIK", "8")),
+    "search.technews24.site": int(os.getenv("SCRAPER_POOL_TECHNEWS24", "16")),
+    "freethemesy.com": int(os.getenv("SCRAPER_POOL_FREETHEMESY", "16")),
+    "sharelink-3.site": int(os.getenv("SCRAPER_POOL_SHARELINK", "32")),
+}
+
+CACHE_DB_PATH = os.getenv("SCRAPER_CACHE_DB", "")
+DIRECT_LINK_CACHE_SIZE = int(os.getenv("SCRAPER_DIRECT_LINK_CACHE_SIZE", "5000"))
+DIRECT_LINK_CACHE_TTL = float(os.getenv("SCRAPER_DIRECT_LINK_CACHE_TTL", "21600"))
+LINK_GROUPS_CACHE_SIZE = int(os.getenv("SCRAPER_LINK_GROUPS_CACHE_SIZE", "500"))
+LINK_GROUPS_CACHE_MAX_BYTES = int(
+    os.getenv("SCRAPER_LINK_GROUPS_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+)
+LINK_GROUPS_FRESH_TTL = float(os.getenv("SCRAPER_LINK_GROUPS_FRESH_TTL", "900"))
+LINK_GROUPS_STALE_TTL = float(os.getenv("SCRAPER_LINK_GROUPS_STALE_TTL", "86400"))
+
+LATEST_FEED_REFRESH_INTERVAL = float(os.getenv("SCRAPER_LATEST_FEED_INTERVAL", "300"))
+
+RESOLVE_MAX_CONCURRENCY = int(os.getenv("SCRAPER_RESOLVE_MAX_CONCURRENCY", "16"))
+RESOLVE_MAX_PER_HOST = int(os.getenv("SCRAPER_RESOLVE_MAX_PER_HOST", "4"))
+# Resolutions per second; 0 disables the rate limit.
+RESOLVE_RATE = float(os.getenv("SCRAPER_RESOLVE_RATE", "8"))
+RESOLVE_BURST = int(os.getenv("SCRAPER_RESOLVE_BURST", "8"))
+
+PREFETCH_ENABLED = os.getenv("SCRAPER_PREFETCH", "1") == "1"
+PREFETCH_INTERVAL = float(os.getenv("SCRAPER_PREFETCH_INTERVAL", "120"))
+# Upstream chains per minute; 0 disables the budget.
+PREFETCH_BUDGET_PER_MINUTE = float(os.getenv("SCRAPER_PREFETCH_BUDGET", "20"))
+PREFETCH_DIRECT_LINKS = os.getenv("SCRAPER_PREFETCH_DIRECT_LINKS", "0") == "1"
+PREFETCH_TOP_SEARCHES = int(os.getenv("SCRAPER_PREFETCH_TOP_SEARCHES", "5"))
+PREFETCH_RESULTS_PER_SEARCH = int(os.getenv("SCRAPER_PREFETCH_RESULTS_PER_SEARCH", "3"))
+PREFETCH_ERROR_THRESHOLD = float(os.getenv("SCRAPER_PREFETCH_ERROR_THRESHOLD", "0.5"))
+PREFETCH_MAX_BACKOFF = float(os.getenv("SCRAPER_PREFETCH_MAX_BACKOFF", "1800"))
+
+# "eager" resolves every link of an expanded movie; "lazy" waits until a
+# group is opened or a link's Resolve button is clicked.
+RESOLVE_MODE = os.getenv("SCRAPER_RESOLVE_MODE", "eager")
+
+UI_FLUSH_INTERVAL = float(os.getenv("SCRAPER_UI_FLUSH_INTERVAL", "0.1"))
+UI_FLUSH_MAX_ITEMS = int(os.getenv("SCRAPER_UI_FLUSH_MAX_ITEMS", "10"))
+
+SEARCH_MAX_PAGES = int(os.getenv("SCRAPER_SEARCH_MAX_PAGES", "5"))
+SEARCH_INDEX_DB = os.getenv("SCRAPER_SEARCH_INDEX_DB", ".scraper/search.db")
+FUZZY_MAX_TITLES = int(os.getenv("SCRAPER_FUZZY_MAX_TITLES", "50000"))
+FUZZY_MIN_SCORE = float(os.getenv("SCRAPER_FUZZY_MIN_SCORE", "0.35"))
+
+CRAWL_ENABLED = os.getenv("SCRAPER_CRAWL", "1") == "1"
+CRAWL_INTERVAL = float(os.getenv("SCRAPER_CRAWL_INTERVAL", "1800"))
+CRAWL_PAGES_PER_RUN = int(os.getenv("SCRAPER_CRAWL_PAGES_PER_RUN", "50"))
+CRAWL_PAGE_DELAY = float(os.getenv("SCRAPER_CRAWL_PAGE_DELAY", "1"))
+
+HOPS = (
+    "movie_page",
+    "technews24_blog",
+    "freethemesy_dld",
+    "freethemesy_api",
+    "final_page",
+    "intermediate",
+    "sharelink_dld",
+    "sharelink_blog",
+    "sharelink_api",
+)
+RETRY_ATTEMPTS = int(os.getenv("SCRAPER_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("SCRAPER_RETRY_BASE_DELAY", "0.2"))
+RETRY_MAX_DELAY = float(os.getenv("SCRAPER_RETRY_MAX_DELAY", "2"))
+# Per-hop overrides, e.g. SCRAPER_RETRY_ATTEMPTS_SHARELINK_API=1.
+HOP_RETRY_ATTEMPTS = {
+    hop: int(os.getenv(f"SCRAPER_RETRY_ATTEMPTS_{hop.upper()}", str(RETRY_ATTEMPTS)))
+    for hop in HOPS
+}
+HOP_RETRY_BASE_DELAY = {
+    hop: float(
+        os.getenv(f"SCRAPER_RETRY_BASE_DELAY_{hop.upper()}", str(RETRY_BASE_DELAY))
+    )
+    for hop in HOPS
+}
+HOP_RETRY_MAX_DELAY = {
+    hop: float(
+        os.getenv(f"SCRAPER_RETRY_MAX_DELAY_{hop.upper()}", str(RETRY_MAX_DELAY))
+    )
+    for hop in HOPS
+}
+# Hops that fire a duplicate request once they run past their observed
+# HEDGE_PERCENTILE latency; the first answer wins. Only the idempotent GET
+# hops by default, the others submit forms.
+HEDGED_HOPS = set(
+    os.getenv("SCRAPER_HEDGED_HOPS", "movie_page,final_page,intermediate").split(",")
+)
+HEDGE_PERCENTILE = float(os.getenv("SCRAPER_HEDGE_PERCENTILE", "0.95"))
+HEDGE_WINDOW = int(os.getenv("SCRAPER_HEDGE_WINDOW", "200"))
+HEDGE_MIN_SAMPLES = int(os.getenv("SCRAPER_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY = float(os.getenv("SCRAPER_HEDGE_MIN_DELAY", "0.05"))
+
+BREAKER_WINDOW = int(os.getenv("SCRAPER_BREAKER_WINDOW", "20"))
+BREAKER_MIN_REQUESTS = int(os.getenv("SCRAPER_BREAKER_MIN_REQUESTS", "10"))
+BREAKER_FAILURE_THRESHOLD = float(os.getenv("SCRAPER_BREAKER_FAILURE_THRESHOLD", "0.5"))
+BREAKER_OPEN_SECONDS = float(os.getenv("SCRAPER_BREAKER_OPEN_SECONDS", "30"))
+BREAKER_PROBES = int(os.getenv("SCRAPER_BREAKER_PROBES", "2"))
+
+# Connect/read timeouts per host: TIMEOUT_MULTIPLIER times the rolling
+# TIMEOUT_PERCENTILE latency of that phase, clamped to the bounds below.
+ADAPTIVE_TIMEOUTS = os.getenv("SCRAPER_ADAPTIVE_TIMEOUTS", "1") == "1"
+TIMEOUT_PERCENTILE = float(os.getenv("SCRAPER_TIMEOUT_PERCENTILE", "0.99"))
+TIMEOUT_MULTIPLIER = float(os.getenv("SCRAPER_TIMEOUT_MULTIPLIER", "3"))
+TIMEOUT_CONNECT_MIN = float(os.getenv("SCRAPER_TIMEOUT_CONNECT_MIN", "0.5"))
+TIMEOUT_CONNECT_MAX = float(os.getenv("SCRAPER_TIMEOUT_CONNECT_MAX", "5"))
+TIMEOUT_READ_MIN = float(os.getenv("SCRAPER_TIMEOUT_READ_MIN", "1"))
+TIMEOUT_READ_MAX = float(os.getenv("SCRAPER_TIMEOUT_READ_MAX", "20"))
+TIMEOUT_WINDOW = int(os.getenv("SCRAPER_TIMEOUT_WINDOW", "200"))
+TIMEOUT_MIN_SAMPLES = int(os.getenv("SCRAPER_TIMEOUT_MIN_SAMPLES", "20"))
+# End-to-end budgets for a whole resolution chain, retries included.
+DOWNLOAD_LINKS_DEADLINE = float(os.getenv("SCRAPER_DOWNLOAD_LINKS_DEADLINE", "30"))
+DIRECT_LINK_DEADLINE = float(os.getenv("SCRAPER_DIRECT_LINK_DEADLINE", "20"))
+
+HTML_PARSER = os.getenv("SCRAPER_HTML_PARSER", "")
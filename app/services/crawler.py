@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from app.services import config, scraper
+from app.services.search_index import SearchIndex, search_index
+
+
+class Crawler:
+    """Incrementally copies fojik.com listing pages into the search index.
+
+    Each run first walks from page 1 until a page brings nothing new, which
+    picks up new releases. It then continues the backfill of older pages from
+    where the previous run stopped, at most ``pages_per_run`` pages. The
+    backfill position is persisted in the index so restarts resume.
+    """
+
+    def __init__(
+        self,
+        index: SearchIndex,
+        interval: float,
+        pages_per_run: int,
+        page_delay: float,
+    ):
+        self.index = index
+        self.interval = interval
+        self.pages_per_run = pages_per_run
+        self.page_delay = page_delay
+
+    async def _crawl_page(self, page: int) -> tuple[int, int, int]:
+        """Index one listing page; returns (items, newly indexed, last page)."""
+        items, last_page = await scraper._fetch_listing_page(page)
+        return (len(items), await asyncio.to_thread(self.index.add, items), last_page)
+
+    async def catch_up(self) -> int:
+        """Crawl from the newest page until reaching already indexed items."""
+        if not await asyncio.to_thread(self.index.get_state, "backfill_page"):
+            return 0
+        added = 0
+        for page in range(1, self.pages_per_run + 1):
+            found, new, last_page = await self._crawl_page(page)
+            added += new
+            if not found or not new or page >= last_page:
+                break
+            await asyncio.sleep(self.page_delay)
+        return added
+
+    async def backfill(self) -> int:
+        """Continue crawling older pages from the saved position."""
+        if await asyncio.to_thread(self.index.get_state, "backfill_complete") == "1":
+            return 0
+        page = int(await asyncio.to_thread(self.index.get_state, "backfill_page", "1"))
+        added = 0
+        for _ in range(self.pages_per_run):
+            found, new, last_page = await self._crawl_page(page)
+            if not found:
+                break
+            added += new
+            page += 1
+            await asyncio.to_thread(self.index.set_state, "backfill_page", str(page))
+            if page > last_page:
+                await asyncio.to_thread(self.index.set_state, "backfill_complete", "1")
+                break
+            await asyncio.sleep(self.page_delay)
+        return added
+
+    async def run_once(self) -> int:
+        added = await self.catch_up()
+        added += await self.backfill()
+        return added
+
+    async def run(self):
+        """Crawl every ``interval`` seconds; registered as a lifespan task."""
+        if not config.CRAWL_ENABLED:
+            return
+        while True:
+            try:
+                added = await self.run_once()
+                if added:
+                    logging.info(f"Crawler indexed {added} new movies")
+            except Exception as e:
+                logging.exception(f"Error crawling listing pages: {e}")
+            await asyncio.sleep(self.interval)
+
+
+crawler = Crawler(
+    search_index,
+    config.CRAWL_INTERVAL,
+    config.CRAWL_PAGES_PER_RUN,
+    config.CRAWL_PAGE_DELAY,
+)
@@ -0,0 +1,52 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+from app.services import config, scraper
+from app.services.singleflight import SingleFlight
+
+
+class LatestFeed:
+    """Process-wide snapshot of the homepage feed, refreshed in the background.
+
+    Sessions read the in-memory snapshot; at most one upstream fetch is in
+    flight at a time, however many callers ask for a refresh concurrently.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[list[dict[str, str]]]],
+        interval: float,
+    ):
+        self._fetch = fetch
+        self.interval = interval
+        self.snapshot: list[dict[str, str]] = []
+        self.refreshed_at = 0.0
+        self._flight = SingleFlight("latest_feed")
+
+    async def get(self) -> list[dict[str, str]]:
+        if self.snapshot:
+            return self.snapshot
+        return await self.refresh()
+
+    async def refresh(self) -> list[dict[str, str]]:
+        return await self._flight.do("latest", self._update)
+
+    async def _update(self) -> list[dict[str, str]]:
+        results = await self._fetch()
+        if results:
+            self.snapshot = results
+            self.refreshed_at = time.time()
+        return self.snapshot
+
+    async def run(self):
+        """Refresh the snapshot every ``interval`` seconds; registered as a lifespan task."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logging.exception(f"Error refreshing latest movies feed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+latest_feed = LatestFeed(scraper.get_latest_movies, config.LATEST_FEED_REFRESH_INTERVAL)
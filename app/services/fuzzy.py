@@ -0,0 +1,212 @@
+import asyncio
+import heapq
+import math
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from typing import Callable
+from app.services import config
+from app.services.search_index import search_index
+
+TITLE_NOISE = re.compile(
+    "\\b(19|20)\\d{2}\\b|\\b\\d{3,4}p\\b|\\b(4k|uhd|hdr|10bit|x264|x265|hevc|"
+    "web-?dl|web-?rip|blu-?ray|brrip|hdrip|hdtc|hdts|hdcam|camrip|dvdrip|"
+    "dual audio|multi audio|org|esubs?|msubs?|hindi|english|bengali|tamil|"
+    "telugu|malayalam|kannada|korean|japanese|dubbed|unofficial|full movie)\\b"
+)
+NON_WORD = re.compile("[^a-z0-9]+")
+WORD_MIN_SCORE = 0.5
+WORD_PREFIX_SCORE = 0.8
+WORDS_PER_QUERY_WORD = 5
+EXTRA_WORD_PENALTY = 0.02
+MAX_CANDIDATES = 200
+SIMILAR_CACHE_SIZE = 1024
+
+
+def normalize_title(title: str) -> str:
+    """Lower-case a title and drop year, quality, source and language noise."""
+    title = TITLE_NOISE.sub(" ", title.lower().replace("&", " and "))
+    return " ".join(NON_WORD.sub(" ", title).split())
+
+
+def trigrams(text: str) -> set[str]:
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TitleIndex:
+    """In-memory typo-tolerant index over normalised movie titles.
+
+    Query words are matched against the vocabulary of title words through a
+    trigram index on that vocabulary; only the rarest trigrams of a word are
+    probed, which is enough to find every word similar enough to count.
+    Candidate titles are drawn from the rarest matching words first, newest
+    titles first, and capped at ``MAX_CANDIDATES`` so a common word such as
+    "the" does not score every title. Titles are ranked by the summed word
+    similarity, with a bonus when the normalised title starts with the query
+    and a small penalty for extra words. Holds at most ``max_titles`` movies,
+    evicting the oldest. ``load`` fills it from ``seed`` at startup.
+    """
+
+    def __init__(
+        self,
+        max_titles: int,
+        min_score: float,
+        seed: Callable[[], list[dict[str, str]]] | None = None,
+    ):
+        self.max_titles = max_titles
+        self.min_score = min_score
+        self._seed = seed
+        self._movies: OrderedDict[str, tuple[dict[str, str], str]] = OrderedDict()
+        self._titles_by_word: defaultdict[str, dict[str, None]] = defaultdict(dict)
+        self._words_by_gram: defaultdict[str, set[str]] = defaultdict(set)
+        self._gram_counts: dict[str, int] = {}
+        self._similar: dict[str, list[tuple[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, movies: list[dict[str, str]]) -> None:
+        with self._lock:
+            self._add(movies)
+
+    async def load(self) -> None:
+        """Index the ``seed`` titles off the event loop; registered as a lifespan task."""
+        if self._seed is None:
+            return
+        seed, self._seed = self._seed, None
+        movies = await asyncio.to_thread(seed)
+        await asyncio.to_thread(self._add_older, movies)
+
+    def _add_older(self, movies: list[dict[str, str]]) -> None:
+        """Add ``movies`` (oldest first) behind anything indexed meanwhile."""
+        for movie in reversed(movies):
+            with self._lock:
+                if len(self._movies) >= self.max_titles:
+                    return
+                if movie["link"] not in self._movies:
+                    self._add([movie])
+                    self._movies.move_to_end(movie["link"], last=False)
+
+    def _add(self, movies: list[dict[str, str]]) -> None:
+        for movie in movies:
+            link = movie["link"]
+            self._remove(link)
+            name = normalize_title(movie["title"])
+            self._movies[link] = (movie, name)
+            for word in set(name.split()):
+                if word not in self._titles_by_word:
+                    self._similar.clear()
+                    grams = trigrams(word)
+                    self._gram_counts[word] = len(grams)
+                    for gram in grams:
+                        self._words_by_gram[gram].add(word)
+                self._titles_by_word[word][link] = None
+        while len(self._movies) > self.max_titles:
+            self._remove(next(iter(self._movies)))
+
+    def _remove(self, link: str) -> None:
+        entry = self._movies.pop(link, None)
+        if entry is None:
+            return
+        for word in set(entry[1].split()):
+            links = self._titles_by_word[word]
+            links.pop(link, None)
+            if links:
+                continue
+            del self._titles_by_word[word]
+            del self._gram_counts[word]
+            self._similar.clear()
+            for gram in trigrams(word):
+                words = self._words_by_gram[gram]
+                words.discard(word)
+                if not words:
+                    del self._words_by_gram[gram]
+
+    def _similar_words(self, word: str) -> list[tuple[str, float]]:
+        """Vocabulary words similar to ``word``, cached until the vocabulary changes."""
+        similar = self._similar.get(word)
+        if similar is None:
+            if len(self._similar) >= SIMILAR_CACHE_SIZE:
+                self._similar.clear()
+            similar = self._similar[word] = self._match_words(word)
+        return similar
+
+    def _match_words(self, word: str) -> list[tuple[str, float]]:
+        grams = trigrams(word)
+        # A word scoring WORD_MIN_SCORE shares at least ``needed`` trigrams
+        # (every word has two or more), so it contains one of the
+        # ``len(grams) - needed + 1`` rarest ones.
+        needed = math.ceil(WORD_MIN_SCORE * (len(grams) + 2) / 2)
+        ordered = sorted(grams, key=lambda g: len(self._words_by_gram.get(g, ())))
+        probes = len(grams) - needed + 1
+        shared = Counter()
+        for gram in ordered[:probes]:
+            shared.update(self._words_by_gram.get(gram, ()))
+        for gram in ordered[probes:]:
+            for other in shared.keys() & self._words_by_gram.get(gram, set()):
+                shared[other] += 1
+        similar = []
+        for other, count in shared.items():
+            score = 2 * count / (len(grams) + self._gram_counts[other])
+            if other.startswith(word):
+                score = max(score, WORD_PREFIX_SCORE)
+            if score >= WORD_MIN_SCORE:
+                similar.append((other, score))
+        similar.sort(key=lambda entry: -entry[1])
+        return similar[:WORDS_PER_QUERY_WORD]
+
+    def _candidates(self, similar: list[list[tuple[str, float]]]) -> list[str]:
+        """Titles holding a matched word, rarest words and newest titles first."""
+        postings = sorted(
+            (
+                self._titles_by_word[other]
+                for options in similar
+                for other, _ in options
+            ),
+            key=len,
+        )
+        candidates: dict[str, None] = {}
+        for links in postings:
+            for link in reversed(links):
+                candidates[link] = None
+                if len(candidates) >= MAX_CANDIDATES:
+                    return list(candidates)
+        return list(candidates)
+
+    def suggest(self, query: str, limit: int = 8) -> list[dict[str, str]]:
+        """Best matching movies for ``query``, most similar first."""
+        name = normalize_title(query)
+        words = name.split()
+        if not words:
+            return []
+        with self._lock:
+            similar = [self._similar_words(word) for word in words]
+            scored = []
+            for link in self._candidates(similar):
+                movie, title = self._movies[link]
+                total = 0.0
+                for options in similar:
+                    for other, similarity in options:
+                        if link in self._titles_by_word[other]:
+                            total += similarity
+                            break
+                score = total / len(words)
+                if title.startswith(name):
+                    score += 0.5
+                score -= EXTRA_WORD_PENALTY * max(0, len(title.split()) - len(words))
+                if score >= self.min_score:
+                    scored.append((score, movie))
+        best = heapq.nlargest(limit, scored, key=lambda entry: entry[0])
+        return [movie for _, movie in best]
+
+    def __len__(self) -> int:
+        return len(self._movies)
+
+
+title_index = TitleIndex(
+    config.FUZZY_MAX_TITLES,
+    config.FUZZY_MIN_SCORE,
+    seed=lambda: search_index.recent(config.FUZZY_MAX_TITLES),
+)
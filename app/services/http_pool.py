@@ -0,0 +1,101 @@
+import threading
+import httpx
+from app.services import config
+from app.services.timeouts import adaptive_timeouts
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """Routes each request to the keep-alive pool of its host.
+
+    Clients built on this transport keep their own cookie jars, but share the
+    underlying connections; closing a client leaves the pools open. When
+    ``SCRAPER_UPSTREAM_OVERRIDE`` is set every request is sent to that origin
+    instead, keeping the original Host header (used by the offline benchmarks).
+    With ``SCRAPER_ADAPTIVE_TIMEOUTS`` on, each request's connect and read
+    timeouts are replaced by the host's learned budgets.
+    """
+
+    def __init__(self, manager: "PoolManager"):
+        self._manager = manager
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if config.ADAPTIVE_TIMEOUTS:
+            request.extensions["timeout"] = adaptive_timeouts.timeout(host).as_dict()
+            request.extensions["trace"] = adaptive_timeouts.tracer(host)
+        if config.UPSTREAM_OVERRIDE:
+            override = httpx.URL(config.UPSTREAM_OVERRIDE)
+            request.url = request.url.copy_with(
+                scheme=override.scheme, host=override.host, port=override.port
+            )
+        transport = self._manager.transport_for(host)
+        self._manager.record(host, transport)
+        return await transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class PoolManager:
+    """Per-host keep-alive connection pools shared by every resolution flow."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._transports: dict[str, httpx.AsyncHTTPTransport] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+        self.transport = PooledTransport(self)
+
+    def transport_for(self, host: str) -> httpx.AsyncHTTPTransport:
+        with self._lock:
+            transport = self._transports.get(host)
+            if transport is None:
+                size = config.POOL_HOST_LIMITS.get(
+                    host, config.POOL_MAX_CONNECTIONS_PER_HOST
+                )
+                transport = httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=size,
+                        max_keepalive_connections=min(
+                            size, config.POOL_MAX_KEEPALIVE_PER_HOST
+                        ),
+                        keepalive_expiry=config.POOL_KEEPALIVE_EXPIRY,
+                    ),
+                    retries=1,
+                )
+                self._transports[host] = transport
+                self._stats[host] = {"hits": 0, "misses": 0}
+            return transport
+
+    def record(self, host: str, transport: httpx.AsyncHTTPTransport) -> None:
+        """Count whether a request finds a warm idle connection to reuse."""
+        pool = getattr(transport, "_pool", None)
+        connections = pool.connections if pool is not None else []
+        warm = any((conn.is_idle() for conn in connections))
+        with self._lock:
+            self._stats[host]["hits" if warm else "misses"] += 1
+
+    def client(self, **kwargs) -> httpx.AsyncClient:
+        """Create a client with its own cookie jar on top of the shared pools."""
+        kwargs.setdefault("follow_redirects", True)
+        return httpx.AsyncClient(transport=self.transport, **kwargs)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            result = {}
+            for host, counters in self._stats.items():
+                pool = getattr(self._transports[host], "_pool", None)
+                result[host] = {
+                    **counters,
+                    "connections": len(pool.connections) if pool is not None else 0,
+                }
+            return result
+
+    async def aclose(self) -> None:
+        with self._lock:
+            transports = list(self._transports.values())
+            self._transports.clear()
+        for transport in transports:
+            await transport.aclose()
+
+
+pool = PoolManager()
@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Iterable
+import httpx
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+Sample = tuple[dict[str, str], float]
+Family = tuple[str, str, str, list[Sample]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join((f'{k}="{_escape(v)}"' for k, v in labels.items())) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def collect(self) -> Family:
+        with self._lock:
+            samples = [(dict(key), value) for key, value in self._values.items()]
+        return (self.name, "counter", self.help, samples)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...]):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self._values: dict[tuple, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def collect(self) -> Family:
+        samples = []
+        with self._lock:
+            for key, counts in self._values.items():
+                labels = dict(key)
+                for bound, count in zip(self.buckets, counts):
+                    samples.append(({**labels, "le": repr(float(bound))}, count))
+                samples.append(({**labels, "le": "+Inf"}, counts[-1]))
+                samples.append(({**labels, "__suffix__": "_sum"}, counts[-2]))
+                samples.append(({**labels, "__suffix__": "_count"}, counts[-1]))
+        return (self.name, "histogram", self.help, samples)
+
+
+class Registry:
+    """Minimal Prometheus registry: owned metrics plus callbacks that report gauges."""
+
+    def __init__(self):
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, help: str) -> Counter:
+        metric = Counter(name, help)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, buckets: tuple[float, ...]) -> Histogram:
+        metric = Histogram(name, help, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        families = [metric.collect() for metric in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        lines = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                labels = dict(labels)
+                suffix = labels.pop("__suffix__", "_bucket" if "le" in labels else "")
+                lines.append(f"{name}{suffix}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+hop_duration = registry.histogram(
+    "scraper_hop_duration_seconds",
+    "Latency of each upstream hop of the resolution chains.",
+    LATENCY_BUCKETS,
+)
+hop_response_bytes = registry.histogram(
+    "scraper_hop_response_bytes",
+    "Response bytes read per upstream hop.",
+    SIZE_BUCKETS,
+)
+hop_outcomes = registry.counter(
+    "scraper_hop_outcomes_total", "Upstream hop results by outcome."
+)
+flow_outcomes = registry.counter(
+    "scraper_flow_outcomes_total",
+    "Resolution chain results by outcome (ok or the failure reason).",
+)
+
+
+def classify(error: BaseException) -> str:
+    """Map an exception raised during a hop to a failure reason label."""
+    if isinstance(error, asyncio.CancelledError):
+        return "cancelled"
+    if isinstance(error, httpx.HTTPStatusError):
+        return "http_error"
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.TransportError):
+        return "transport_error"
+    return "exception"
+
+
+class HopTimer:
+    """Context manager recording latency, bytes read and outcome of one hop.
+
+    The outcome is ``ok`` unless the block raises or calls ``fail``.
+    """
+
+    def __init__(self, flow: str, hop: str):
+        self.flow = flow
+        self.hop = hop
+        self.outcome = "ok"
+        self.response: httpx.Response | None = None
+
+    def track(self, response: httpx.Response) -> httpx.Response:
+        self.response = response
+        return response
+
+    def fail(self, reason: str) -> None:
+        self.outcome = reason
+
+    def __enter__(self) -> "HopTimer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None and self.outcome == "ok":
+            self.outcome = classify(exc)
+        labels = {"flow": self.flow, "hop": self.hop}
+        hop_duration.observe(time.perf_counter() - self.started, **labels)
+        if self.response is not None:
+            hop_response_bytes.observe(self.response.num_bytes_downloaded, **labels)
+        hop_outcomes.inc(outcome=self.outcome, **labels)
+
+
+def hop(flow: str, hop: str) -> HopTimer:
+    return HopTimer(flow, hop)
+
+
+def render() -> str:
+    return registry.render()
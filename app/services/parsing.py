@@ -0,0 +1,100 @@
+import html
+import re
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
+from app.services import config
+
+try:
+    import lxml  # noqa: F401
+
+    PARSER = config.HTML_PARSER or "lxml"
+except ImportError:
+    PARSER = config.HTML_PARSER or "html.parser"
+MOVIE_ITEMS = SoupStrainer("article", class_=re.compile("(^|\\s)item(\\s|$)"))
+INPUT_TAG = re.compile("<input\\b[^>]*>", re.IGNORECASE)
+TAG_ATTRIBUTE = re.compile(
+    "([\\w-]+)\\s*=\\s*(?:\"([^\"]*)\"|'([^']*)'|([^\\s\"'>]+))", re.IGNORECASE
+)
+MAX_TAG_LENGTH = 8192
+DRAIN_LIMIT = 64 * 1024
+
+
+def make_soup(html: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+    """Parse ``html`` with the configured backend, optionally keeping only ``parse_only`` elements."""
+    return BeautifulSoup(html, PARSER, parse_only=parse_only)
+
+
+class TokenScanner:
+    """Incrementally finds hidden <input> values and regex captures in a page.
+
+    Text is fed in chunks as it arrives; no DOM is built. ``patterns`` map a
+    token name to a regex whose first group is the value; like the regexes
+    they replace, they must not span a newline.
+    """
+
+    def __init__(self, inputs: tuple[str, ...] = (), patterns: dict | None = None):
+        self.inputs = set(inputs)
+        self.patterns = dict(patterns or {})
+        self.found: dict[str, str] = {}
+        self._text = ""
+        self._input_pos = 0
+        self._pattern_pos = 0
+
+    @property
+    def done(self) -> bool:
+        return not self.inputs and not self.patterns
+
+    def feed(self, chunk: str) -> None:
+        previous_end = len(self._text)
+        self._text += chunk
+        if self.inputs:
+            self._scan_inputs()
+        if self.patterns:
+            start = self._text.rfind("\n", 0, previous_end) + 1
+            for name, pattern in list(self.patterns.items()):
+                match = pattern.search(self._text, start)
+                if match:
+                    self.found[name] = match.group(1)
+                    del self.patterns[name]
+
+    def _scan_inputs(self) -> None:
+        end = self._input_pos
+        for match in INPUT_TAG.finditer(self._text, self._input_pos):
+            end = match.end()
+            attrs = {
+                name.lower(): html.unescape(next((v for v in values if v), ""))
+                for name, *values in TAG_ATTRIBUTE.findall(match.group(0))
+            }
+            name = attrs.get("name")
+            if attrs.get("type", "").lower() == "hidden" and name in self.inputs:
+                if "value" in attrs:
+                    self.found[name] = attrs["value"]
+                self.inputs.discard(name)
+        self._input_pos = max(end, len(self._text) - MAX_TAG_LENGTH)
+
+
+async def stream_tokens(
+    response: httpx.Response,
+    inputs: tuple[str, ...] = (),
+    patterns: dict | None = None,
+) -> dict[str, str]:
+    """Read a streamed response only until every requested token is found.
+
+    Up to ``DRAIN_LIMIT`` more bytes are then drained so the connection can
+    go back to the keep-alive pool, also for chunked bodies without a
+    ``Content-Length``; a longer remainder is abandoned.
+    """
+    scanner = TokenScanner(inputs, patterns)
+    expected = response.headers.get("content-length")
+    drain_until = None
+    async for chunk in response.aiter_text():
+        if drain_until is None:
+            scanner.feed(chunk)
+            if not scanner.done:
+                continue
+            drain_until = response.num_bytes_downloaded + DRAIN_LIMIT
+            if expected is not None and int(expected) > drain_until:
+                break
+        elif response.num_bytes_downloaded > drain_until:
+            break
+    return scanner.found
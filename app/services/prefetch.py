@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from app.services import config, metrics, scraper
+from app.services.breaker import UpstreamUnavailable
+from app.services.feed import LatestFeed, latest_feed
+from app.services.scheduler import (
+    DEPRIORITIZED,
+    ResolutionScheduler,
+    TokenBucket,
+    resolution_scheduler,
+)
+
+ERROR_WINDOW = 20
+MIN_SAMPLES = 5
+
+prefetch_outcomes = metrics.registry.counter(
+    "scraper_prefetch_total", "Speculative prefetches by kind and outcome."
+)
+
+
+class Prefetcher:
+    """Warms link groups (and optionally direct links) for likely clicks.
+
+    Candidates are the latest feed and the first results of the most frequent
+    recent searches. Every upstream chain spends one token from a per-minute
+    budget, and prefetching pauses with exponential backoff while at least
+    ``error_threshold`` of recent chains fail.
+    """
+
+    def __init__(
+        self,
+        feed: LatestFeed,
+        scheduler: ResolutionScheduler,
+        interval: float,
+        budget_per_minute: float,
+        direct_links: bool,
+        error_threshold: float,
+        max_backoff: float,
+    ):
+        self.feed = feed
+        self.scheduler = scheduler
+        self.interval = interval
+        self.direct_links = direct_links
+        self.error_threshold = error_threshold
+        self.max_backoff = max_backoff
+        self.budget = TokenBucket(
+            budget_per_minute / 60, max(1, int(budget_per_minute))
+        )
+        self.searches: OrderedDict[str, tuple[int, list[str]]] = OrderedDict()
+        self.outcomes: deque[bool] = deque(maxlen=ERROR_WINDOW)
+        self.backoff = 0.0
+
+    def record_search(self, query: str, links: list[str]) -> None:
+        """Remember a search and its top results as prefetch candidates."""
+        key = query.strip().lower()
+        if not key or not links:
+            return
+        count, _ = self.searches.pop(key, (0, []))
+        self.searches[key] = (count + 1, links[: config.PREFETCH_RESULTS_PER_SEARCH])
+        while len(self.searches) > config.PREFETCH_TOP_SEARCHES * 4:
+            self.searches.popitem(last=False)
+
+    def candidates(self) -> list[str]:
+        links = [m["link"] for m in self.feed.snapshot]
+        top = sorted(self.searches.values(), key=lambda entry: -entry[0])
+        for _, results in top[: config.PREFETCH_TOP_SEARCHES]:
+            links.extend(results)
+        return list(dict.fromkeys(links))
+
+    def error_rate(self) -> float:
+        if len(self.outcomes) < MIN_SAMPLES:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    async def _spend(self) -> None:
+        while not self.budget.try_take():
+            await asyncio.sleep(self.budget.wait_time())
+
+    def _record(self, kind: str, ok: bool, outcome: str = "") -> None:
+        self.outcomes.append(ok)
+        prefetch_outcomes.inc(kind=kind, outcome=outcome or ("ok" if ok else "error"))
+
+    async def _warm(self, movie_link: str) -> None:
+        age = scraper.link_groups_cache.age(movie_link)
+        if age is not None and age < scraper.link_groups_cache.fresh_ttl:
+            prefetch_outcomes.inc(kind="link_groups", outcome="fresh")
+            return
+        await self._spend()
+        try:
+            groups = await scraper.get_download_links(
+                movie_link, refresh=age is not None
+            )
+        except UpstreamUnavailable:
+            self._record("link_groups", False, "upstream_unavailable")
+            return
+        self._record("link_groups", bool(groups))
+        if not groups or not self.direct_links:
+            return
+        for group in groups:
+            for link in group["links"]:
+                url = link["url"]
+                if scraper.cached_direct_link(url) is not None:
+                    continue
+                await self._spend()
+                try:
+                    direct = await self.scheduler.run(
+                        lambda: scraper.fetch_direct_link(url),
+                        host=scraper.SHARELINK_HOST,
+                        priority=DEPRIORITIZED,
+                    )
+                except UpstreamUnavailable:
+                    self._record("direct_link", False, "upstream_unavailable")
+                    return
+                self._record("direct_link", direct.startswith("http"))
+
+    async def run_once(self) -> None:
+        for link in self.candidates():
+            await self._warm(link)
+            if self.error_rate() >= self.error_threshold:
+                self.backoff = min(
+                    self.max_backoff, max(self.interval, self.backoff * 2)
+                )
+                logging.warning(
+                    f"Prefetch paused for {self.backoff:.0f}s: upstream error rate "
+                    f"{self.error_rate():.0%}"
+                )
+                self.outcomes.clear()
+                return
+        self.backoff = 0.0
+
+    async def run(self):
+        """Prefetch every ``interval`` seconds; registered as a lifespan task."""
+        if not config.PREFETCH_ENABLED:
+            return
+        await self.feed.get()
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logging.exception(f"Error prefetching links: {e}")
+            await asyncio.sleep(self.backoff or self.interval)
+
+
+prefetcher = Prefetcher(
+    latest_feed,
+    resolution_scheduler,
+    config.PREFETCH_INTERVAL,
+    config.PREFETCH_BUDGET_PER_MINUTE,
+    config.PREFETCH_DIRECT_LINKS,
+    config.PREFETCH_ERROR_THRESHOLD,
+    config.PREFETCH_MAX_BACKOFF,
+)
@@ -0,0 +1,118 @@
+import asyncio
+import random
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+import httpx
+from app.services import config, metrics
+
+T = TypeVar("T")
+
+hop_retries = metrics.registry.counter(
+    "scraper_hop_retries_total", "Upstream hop attempts retried after a failure."
+)
+hop_hedges = metrics.registry.counter(
+    "scraper_hop_hedges_total",
+    "Hedged duplicate requests by hop and which request answered first.",
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How one hop is retried and hedged.
+
+    A failed attempt is retried up to ``attempts`` times in total, sleeping a
+    random ("full jitter") delay of up to ``base_delay * 2**n`` seconds,
+    capped at ``max_delay``. With ``hedge`` set, a duplicate request is fired
+    once an attempt runs past the hop's observed ``hedge_percentile`` latency
+    and whichever answers first wins.
+    """
+
+    attempts: int = config.RETRY_ATTEMPTS
+    base_delay: float = config.RETRY_BASE_DELAY
+    max_delay: float = config.RETRY_MAX_DELAY
+    hedge: bool = False
+    hedge_percentile: float = config.HEDGE_PERCENTILE
+
+    def backoff(self, retry: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class LatencyTracker:
+    """Rolling window of successful attempt latencies per hop."""
+
+    def __init__(self, window: int, min_samples: int):
+        self.min_samples = min_samples
+        self._samples: defaultdict[str, deque[float]] = defaultdict(
+            lambda: deque(maxlen=window)
+        )
+
+    def observe(self, hop: str, seconds: float) -> None:
+        self._samples[hop].append(seconds)
+
+    def percentile(self, hop: str, pct: float) -> float | None:
+        samples = self._samples.get(hop)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+def retryable(error: BaseException) -> bool:
+    """Transport errors, timeouts and 429/5xx answers are worth another try."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+latencies = LatencyTracker(config.HEDGE_WINDOW, config.HEDGE_MIN_SAMPLES)
+
+
+async def _timed(hop: str, fn: Callable[[], Awaitable[T]]) -> T:
+    started = time.perf_counter()
+    result = await fn()
+    latencies.observe(hop, time.perf_counter() - started)
+    return result
+
+
+async def _attempt(hop: str, fn: Callable[[], Awaitable[T]], policy: RetryPolicy) -> T:
+    delay = latencies.percentile(hop, policy.hedge_percentile) if policy.hedge else None
+    if delay is None:
+        return await _timed(hop, fn)
+    primary = asyncio.ensure_future(_timed(hop, fn))
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=max(delay, config.HEDGE_MIN_DELAY))
+        if not done:
+            tasks.add(asyncio.ensure_future(_timed(hop, fn)))
+        while True:
+            done, pending = await asyncio.wait(
+                tasks, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if len(tasks) > 1:
+                        hop_hedges.inc(
+                            hop=hop, winner="primary" if task is primary else "hedge"
+                        )
+                    return task.result()
+            if not pending:
+                return done.pop().result()
+            tasks = pending
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call(hop: str, fn: Callable[[], Awaitable[T]], policy: RetryPolicy) -> T:
+    """Run one hop under ``policy``; ``fn`` performs a single attempt."""
+    for retry in range(policy.attempts):
+        try:
+            return await _attempt(hop, fn, policy)
+        except Exception as e:
+            if retry + 1 >= policy.attempts or not retryable(e):
+                raise
+        hop_retries.inc(hop=hop)
+        await asyncio.sleep(policy.backoff(retry))
@@ -0,0 +1,185 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+from app.services import config
+
+DEPRIORITIZED = 1_000_000
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` operations per second with bursts of ``burst``.
+
+    A ``rate`` of 0 or less disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    host: str = field(compare=False)
+    tag: str = field(compare=False)
+    base: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+class ResolutionScheduler:
+    """Priority queue in front of link resolution.
+
+    Work is admitted in priority order (lower first) subject to a global
+    concurrency limit, a per-host concurrency limit and a token-bucket rate.
+    Waiters are tagged (by movie link) so a whole card can be demoted when
+    the user abandons it.
+    """
+
+    def __init__(
+        self, max_concurrency: int, max_per_host: int, rate: float, burst: int
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.bucket = TokenBucket(rate, burst)
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._host_running: defaultdict[str, int] = defaultdict(int)
+        self._timer: asyncio.TimerHandle | None = None
+        self.admitted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        host: str,
+        priority: int = 0,
+        tag: str = "",
+    ) -> Any:
+        await self._acquire(host, priority, tag)
+        try:
+            return await fn()
+        finally:
+            self._release(host)
+
+    def deprioritize(self, tag: str) -> None:
+        """Move every queued waiter of ``tag`` behind all other work."""
+        self._retag(tag, DEPRIORITIZED)
+
+    def restore(self, tag: str) -> None:
+        self._retag(tag, 0)
+
+    def _retag(self, tag: str, penalty: int) -> None:
+        changed = False
+        for waiter in self._queue:
+            if waiter.tag == tag and waiter.priority != waiter.base + penalty:
+                waiter.priority = waiter.base + penalty
+                changed = True
+        if changed:
+            heapq.heapify(self._queue)
+
+    async def _acquire(self, host: str, priority: int, tag: str) -> None:
+        waiter = _Waiter(
+            priority=priority,
+            seq=next(self._seq),
+            host=host,
+            tag=tag,
+            base=priority,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued_at=time.monotonic(),
+        )
+        heapq.heappush(self._queue, waiter)
+        self._pump()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(host)
+            elif waiter in self._queue:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+            raise
+
+    def _release(self, host: str) -> None:
+        self._running -= 1
+        self._host_running[host] -= 1
+        self._pump()
+
+    def _pump(self) -> None:
+        blocked = []
+        while self._queue and self._running < self.max_concurrency:
+            waiter = heapq.heappop(self._queue)
+            if waiter.future.done():
+                continue
+            if self._host_running[waiter.host] >= self.max_per_host:
+                blocked.append(waiter)
+                continue
+            if not self.bucket.try_take():
+                blocked.append(waiter)
+                self._schedule_pump(self.bucket.wait_time())
+                break
+            waited = time.monotonic() - waiter.enqueued_at
+            self.admitted += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self._running += 1
+            self._host_running[waiter.host] += 1
+            waiter.future.set_result(None)
+        for waiter in blocked:
+            heapq.heappush(self._queue, waiter)
+
+    def _schedule_pump(self, delay: float) -> None:
+        if self._timer is not None and not self._timer.cancelled():
+            return
+        self._timer = asyncio.get_running_loop().call_later(delay, self._timer_fired)
+
+    def _timer_fired(self) -> None:
+        self._timer = None
+        self._pump()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "running": self._running,
+            "running_per_host": {h: n for h, n in self._host_running.items() if n},
+            "admitted": self.admitted,
+            "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+resolution_scheduler = ResolutionScheduler(
+    config.RESOLVE_MAX_CONCURRENCY,
+    config.RESOLVE_MAX_PER_HOST,
+    config.RESOLVE_RATE,
+    config.RESOLVE_BURST,
+)
@@ -1,12 +1,25 @@
-import requests
 import re
 import ast
+import asyncio
 import json
 import logging
-from bs4 import BeautifulSoup
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+from urllib.parse import urlparse
+from app.services import config, metrics, resilience
+from app.services.breaker import UpstreamUnavailable, breakers
+from app.services.canonical import GROUP_KEYWORDS, canonicalize
+from app.services.cache import StaleWhileRevalidateCache, TTLCache
+from app.services.fuzzy import title_index
+from app.services.http_pool import pool
+from app.services.parsing import MOVIE_ITEMS, make_soup, stream_tokens
+from app.services.resilience import RetryPolicy
+from app.services.scheduler import resolution_scheduler
+from app.services.search_index import search_index
+from app.services.singleflight import SingleFlight
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
 TIMEOUT = 10
 COOKIES = {
     "starstruck_c64520dd9f1cfb797aa415c1816a487c": "17056c72fb574b1051c60a2706bd4d07",
@@ -27,50 +40,120 @@ HEADERS = {
     "upgrade-insecure-requests": "1",
     "user-agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1",
 }
+SSS_VAR = re.compile("var sss = '(.*?)';")
+FREETHEMESY_SSS_VAR = re.compile("var sss = '(.*?)'; var")
+FREETHEMESY_FETCH_LIST = re.compile("_0x12fb2a=(.*?);_0x3073")
+SHARELINK_V_VAR = re.compile("v: '(.*?)'")
+SEARCH_PAGE_LINK = re.compile("fojik\\.com/page/(\\d+)/")
+T = TypeVar("T")
+TECHNEWS24_HOST = "search.technews24.site"
+FREETHEMESY_HOST = "freethemesy.com"
+SHARELINK_HOST = "sharelink-3.site"
+# Retry/hedge policy per hop of the download and direct link chains.
+HOP_POLICIES = {
+    hop: RetryPolicy(
+        attempts=config.HOP_RETRY_ATTEMPTS[hop],
+        base_delay=config.HOP_RETRY_BASE_DELAY[hop],
+        max_delay=config.HOP_RETRY_MAX_DELAY[hop],
+        hedge=hop in config.HEDGED_HOPS,
+    )
+    for hop in config.HOPS
+}
 DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
 }
-session = requests.Session()
-session.headers.update(HEADERS)
-session.cookies.update(COOKIES)
+
+
+class HopFailure(Exception):
+    """A hop answered, but without the token the next hop needs."""
+
+    def __init__(self, reason: str, message: str = ""):
+        super().__init__(message or reason)
+        self.reason = reason
+        self.message = message
+
+
+session = pool.client(headers=HEADERS, cookies=COOKIES, timeout=TIMEOUT)
+direct_link_cache = TTLCache(
+    "direct_links",
+    max_entries=config.DIRECT_LINK_CACHE_SIZE,
+    ttl=config.DIRECT_LINK_CACHE_TTL,
+    db_path=config.CACHE_DB_PATH,
+)
+search_flight = SingleFlight("search")
+links_flight = SingleFlight("download_links")
+direct_flight = SingleFlight("direct_link")
+link_groups_cache = StaleWhileRevalidateCache(
+    "link_groups",
+    max_entries=config.LINK_GROUPS_CACHE_SIZE,
+    max_bytes=config.LINK_GROUPS_CACHE_MAX_BYTES,
+    fresh_ttl=config.LINK_GROUPS_FRESH_TTL,
+    stale_ttl=config.LINK_GROUPS_STALE_TTL,
+)
+
+
+def _has_group_keyword(text: str) -> bool:
+    text = text.lower()
+    return any((keyword in text for keyword in GROUP_KEYWORDS))
+
+
+def _ul_links(ul) -> list[dict]:
+    links = []
+    for li in ul.find_all("li"):
+        label_parts = li.get_text(strip=True).split(":")
+        label = label_parts[0] if label_parts else "Link"
+        for a in li.find_all("a"):
+            links.append(
+                {"label": label, "type": a.get_text(strip=True), "url": a["href"]}
+            )
+    return links
+
+
+def _following_links(parent) -> dict[int, tuple | None]:
+    """Map each child of ``parent`` to the <ul> links that follow it.
+
+    Siblings are scanned once, right to left. The value for a child is a
+    linked list of the link chunks of every <ul> between it and the next
+    h2/p group heading, so each heading's links are found without rescanning
+    its siblings.
+    """
+    following = {}
+    chunks = None
+    children = [child for child in parent.children if child.name]
+    for child in reversed(children):
+        following[id(child)] = chunks
+        if child.name in ("h2", "p") and _has_group_keyword(child.get_text()):
+            chunks = None
+        elif child.name == "ul":
+            chunks = (_ul_links(child), chunks)
+    return following
 
 
 def extract_all_links(html: str) -> list[dict]:
-    """Extract download links from HTML content using multiple strategies."""
-    soup = BeautifulSoup(html, "html.parser")
+    """Extract download links from HTML content using multiple strategies.
+
+    Group headings are collected in a single pass; the siblings of each
+    parent element are scanned at most once, so the cost stays linear in the
+    page size even for season packs with hundreds of episodes.
+    """
+    soup = make_soup(html)
     results = []
+    following_by_parent = {}
     for tag in soup.find_all(["h2", "p", "strong", "em", "span"]):
         text = tag.get_text(strip=True)
-        if (
-            any((keyword in text.lower() for keyword in ["epi", "batch", "part"]))
-            or tag.name == "h2"
-        ):
-            title = text
-            links = []
-            next_sibling = tag.find_next_sibling()
-            while next_sibling:
-                if next_sibling.name in ["h2", "p"] and any(
-                    (
-                        kw in next_sibling.get_text().lower()
-                        for kw in ["epi", "batch", "part"]
-                    )
-                ):
-                    break
-                if next_sibling.name == "ul":
-                    for li in next_sibling.find_all("li"):
-                        label_parts = li.get_text(strip=True).split(":")
-                        label = label_parts[0] if label_parts else "Link"
-                        for a in li.find_all("a"):
-                            links.append(
-                                {
-                                    "label": label,
-                                    "type": a.get_text(strip=True),
-                                    "url": a["href"],
-                                }
-                            )
-                next_sibling = next_sibling.find_next_sibling()
-            if links:
-                results.append({"title": title, "links": links})
+        if not (_has_group_keyword(text) or tag.name == "h2"):
+            continue
+        parent = tag.parent
+        following = following_by_parent.get(id(parent))
+        if following is None:
+            following = following_by_parent[id(parent)] = _following_links(parent)
+        links = []
+        chunks = following[id(tag)]
+        while chunks is not None:
+            chunk, chunks = chunks
+            links.extend((dict(link) for link in chunk))
+        if links:
+            results.append({"title": text, "links": links})
     if not results:
         fallback = []
         quality_blocks = soup.find_all("p", style=re.compile("text-align: center;"))
@@ -91,100 +174,256 @@ def extract_all_links(html: str) -> list[dict]:
     return results
 
 
-def search_movie(query: str) -> list[dict[str, str]]:
-    """Search for movies on fojik.com."""
-    try:
-        params = {"s": query}
-        resp = session.get("https://fojik.com/", params=params, timeout=TIMEOUT)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        items = soup.find_all("article", class_="item")
+def coalescing_stats() -> dict[str, dict[str, int]]:
+    """Counters of calls served by an already in-flight upstream operation."""
+    return {f.name: f.stats() for f in (search_flight, links_flight, direct_flight)}
+
+
+def _parse_movie_items(html: str) -> list[dict[str, str]]:
+    """Parse the article.item cards of a fojik.com listing page."""
+    soup = make_soup(html, MOVIE_ITEMS)
+    items = soup.find_all("article", class_="item")
+    results = []
+    for item in items:
+        a_tag = item.find("a", href=True)
+        img_tag = item.find("img", src=True)
+        title = "Unknown Title"
+        title_elem = item.find(["h2", "h3"])
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+        elif a_tag and a_tag.get_text(strip=True):
+            title = a_tag.get_text(strip=True)
+        elif img_tag and img_tag.get("alt"):
+            title = img_tag["alt"]
+        link = a_tag["href"] if a_tag else ""
+        image = img_tag["src"] if img_tag else ""
+        if link:
+            results.append({"title": title, "image": image, "link": link})
+    return results
+
+
+async def search_movie(query: str) -> list[dict[str, str]]:
+    """Search for movies on fojik.com, collecting every result page."""
+
+    async def collect() -> list[dict[str, str]]:
         results = []
-        for item in items:
-            a_tag = item.find("a", href=True)
-            img_tag = item.find("img", src=True)
-            title = "Unknown Title"
-            title_elem = item.find(["h2", "h3"])
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-            elif a_tag and a_tag.get_text(strip=True):
-                title = a_tag.get_text(strip=True)
-            elif img_tag and img_tag.get("alt"):
-                title = img_tag["alt"]
-            link = a_tag["href"] if a_tag else ""
-            image = img_tag["src"] if img_tag else ""
-            if link:
-                results.append({"title": title, "image": image, "link": link})
+        async for batch in search_pages(query):
+            results.extend(batch)
         return results
+
+    return await search_flight.do(query.strip().lower(), collect)
+
+
+async def search_pages(query: str) -> AsyncIterator[list[dict[str, str]]]:
+    """Yield search results page by page, without duplicates.
+
+    Matches in the local search index come first, in one batch. Once the
+    crawler has backfilled the whole site they are the whole answer; until
+    then live results are merged in. The first live page tells how many pages
+    exist; the rest (up to ``config.SEARCH_MAX_PAGES``) are fetched
+    concurrently, indexed and yielded in page order as they arrive.
+    """
+    indexed = await asyncio.to_thread(search_index.search, query)
+    if indexed:
+        yield indexed
+        complete = await asyncio.to_thread(search_index.get_state, "backfill_complete")
+        if complete == "1":
+            return
+    key = query.strip().lower()
+    first, last_page = await search_flight.do(
+        f"{key}|1", lambda: _fetch_listing_page(1, query)
+    )
+    seen = {item["link"] for item in indexed}
+
+    async def fresh(items: list[dict[str, str]]) -> list[dict[str, str]]:
+        batch = []
+        for item in items:
+            if item["link"] not in seen:
+                seen.add(item["link"])
+                batch.append(item)
+        await asyncio.to_thread(search_index.add, batch)
+        return batch
+
+    batch = await fresh(first)
+    if batch or not indexed:
+        yield batch
+    pages = [
+        asyncio.ensure_future(
+            search_flight.do(
+                f"{key}|{page}", lambda page=page: _fetch_listing_page(page, query)
+            )
+        )
+        for page in range(2, min(last_page, config.SEARCH_MAX_PAGES) + 1)
+    ]
+    try:
+        for page in pages:
+            items, _ = await page
+            batch = await fresh(items)
+            if batch:
+                yield batch
+    finally:
+        for page in pages:
+            page.cancel()
+
+
+async def _fetch_listing_page(
+    page: int, query: str = ""
+) -> tuple[list[dict[str, str]], int]:
+    """Return the movies of one listing (or search result) page and the last page number."""
+    url = "https://fojik.com/" if page == 1 else f"https://fojik.com/page/{page}/"
+    try:
+        params = {"s": query} if query else None
+        with metrics.hop("search" if query else "listing", "fojik") as hop:
+            resp = hop.track(await session.get(url, params=params))
+            resp.raise_for_status()
+        pages = [int(n) for n in SEARCH_PAGE_LINK.findall(resp.text)]
+        items = _parse_movie_items(resp.text)
+        title_index.add(items)
+        return (items, max(pages, default=page))
     except Exception as e:
-        logging.exception(f"Error searching movie '{query}': {e}")
-        return []
+        if query:
+            logging.exception(f"Error searching movie '{query}' (page {page}): {e}")
+        else:
+            logging.exception(f"Error fetching listing page {page}: {e}")
+        return ([], page)
 
 
-def get_latest_movies() -> list[dict[str, str]]:
+async def get_latest_movies() -> list[dict[str, str]]:
     """Fetch latest movies from fojik.com homepage."""
     try:
-        resp = session.get("https://fojik.com/", timeout=TIMEOUT)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        items = soup.find_all("article", class_="item")
-        results = []
-        for item in items:
-            a_tag = item.find("a", href=True)
-            img_tag = item.find("img", src=True)
-            title = "Unknown Title"
-            title_elem = item.find(["h2", "h3"])
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-            elif a_tag and a_tag.get_text(strip=True):
-                title = a_tag.get_text(strip=True)
-            elif img_tag and img_tag.get("alt"):
-                title = img_tag["alt"]
-            link = a_tag["href"] if a_tag else ""
-            image = img_tag["src"] if img_tag else ""
-            if link:
-                results.append({"title": title, "image": image, "link": link})
-        return results[:10]
+        with metrics.hop("latest", "fojik") as hop:
+            resp = hop.track(await session.get("https://fojik.com/"))
+            resp.raise_for_status()
+        items = _parse_movie_items(resp.text)[:10]
+        title_index.add(items)
+        return items
     except Exception as e:
         logging.exception(f"Error fetching latest movies: {e}")
         return []
 
 
-def get_download_links(url: str) -> list[dict]:
-    """Navigate through protection layers to get download links."""
+async def get_download_links(url: str, refresh: bool = False) -> list[dict]:
+    """Navigate through protection layers to get download links.
+
+    Returns canonical ``{"title", "links"}`` groups (see ``canonicalize``) in
+    which every link URL appears once. Results are served from the link group
+    cache; pass ``refresh`` to bypass it.
+    """
+    return await link_groups_cache.get(
+        url,
+        lambda: links_flight.do(url, lambda: _fetch_download_links(url)),
+        refresh=refresh,
+    )
+
+
+async def _fetch_download_links(url: str) -> list[dict]:
     try:
-        local_session = requests.Session()
-        local_session.headers.update(DEFAULT_HEADERS)
-        response = local_session.get(url, timeout=TIMEOUT)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        fu_input = soup.find("input", {"type": "hidden", "name": "FU"})
-        fn_input = soup.find("input", {"type": "hidden", "name": "FN"})
-        if not fu_input or not fn_input:
-            logger.warning(f"Could not find hidden inputs FU/FN on {url}")
-            return []
-        response = local_session.post(
-            "https://search.technews24.site/blog.php",
-            data={"FU": fu_input["value"], "FN": fn_input["value"]},
-            timeout=TIMEOUT,
+        breakers.check(urlparse(url).hostname or "", TECHNEWS24_HOST, FREETHEMESY_HOST)
+        links = await asyncio.wait_for(
+            _walk_download_chain(url), config.DOWNLOAD_LINKS_DEADLINE
+        )
+    except UpstreamUnavailable:
+        metrics.flow_outcomes.inc(flow="download_links", outcome="upstream_unavailable")
+        raise
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Download links for {url} exceeded {config.DOWNLOAD_LINKS_DEADLINE}s"
         )
-        soup = BeautifulSoup(response.text, "html.parser")
-        fu2_input = soup.find("input", {"type": "hidden", "name": "FU2"})
-        if not fu2_input:
-            logger.warning("Could not find hidden input FU2")
-            return []
-        response = local_session.post(
-            "https://freethemesy.com/dld.php",
-            data={"FU2": fu2_input["value"]},
-            timeout=TIMEOUT,
+        metrics.flow_outcomes.inc(flow="download_links", outcome="deadline_exceeded")
+        return []
+    except HopFailure as e:
+        if e.message:
+            logger.warning(e.message)
+        metrics.flow_outcomes.inc(flow="download_links", outcome=e.reason)
+        return []
+    except Exception as e:
+        metrics.flow_outcomes.inc(flow="download_links", outcome=metrics.classify(e))
+        logging.exception(f"Error getting download links: {e}")
+        return []
+    groups = canonicalize(_filter_links(links))
+    metrics.flow_outcomes.inc(
+        flow="download_links", outcome="ok" if groups else "no_links"
+    )
+    return groups
+
+
+async def _hop(
+    flow: str, name: str, host: str, fn: Callable[[metrics.HopTimer], Awaitable[T]]
+) -> T:
+    """Run one hop attempt ``fn`` under its retry/hedge policy and ``host``'s circuit."""
+
+    async def attempt() -> T:
+        breaker = breakers.get(host)
+        breaker.acquire()
+        ok = None
+        try:
+            with metrics.hop(flow, name) as hop:
+                result = await fn(hop)
+            ok = True
+            return result
+        except Exception as e:
+            ok = not resilience.retryable(e)
+            raise
+        finally:
+            breaker.record(ok)
+
+    return await resilience.call(name, attempt, HOP_POLICIES[name])
+
+
+async def _walk_download_chain(url: str) -> list[dict]:
+    flow = "download_links"
+    async with pool.client(headers=DEFAULT_HEADERS, timeout=TIMEOUT) as local_session:
+
+        async def movie_page(hop: metrics.HopTimer) -> dict[str, str]:
+            async with local_session.stream("GET", url) as response:
+                hop.track(response).raise_for_status()
+                tokens = await stream_tokens(response, inputs=("FU", "FN"))
+            if "FU" not in tokens or "FN" not in tokens:
+                hop.fail("missing_fu_fn")
+                raise HopFailure(
+                    "missing_fu_fn", f"Could not find hidden inputs FU/FN on {url}"
+                )
+            return tokens
+
+        async def technews24_blog(hop: metrics.HopTimer) -> dict[str, str]:
+            async with local_session.stream(
+                "POST",
+                "https://search.technews24.site/blog.php",
+                data={"FU": tokens["FU"], "FN": tokens["FN"]},
+            ) as response:
+                hop.track(response).raise_for_status()
+                fu2 = await stream_tokens(response, inputs=("FU2",))
+            if "FU2" not in fu2:
+                hop.fail("missing_fu2")
+                raise HopFailure("missing_fu2", "Could not find hidden input FU2")
+            return fu2
+
+        async def freethemesy_dld(hop: metrics.HopTimer) -> dict[str, str]:
+            async with local_session.stream(
+                "POST", "https://freethemesy.com/dld.php", data={"FU2": tokens["FU2"]}
+            ) as response:
+                hop.track(response).raise_for_status()
+                js_vars = await stream_tokens(
+                    response,
+                    patterns={
+                        "sss": FREETHEMESY_SSS_VAR,
+                        "fetch": FREETHEMESY_FETCH_LIST,
+                    },
+                )
+            if "sss" not in js_vars or "fetch" not in js_vars:
+                hop.fail("regex_miss")
+                raise HopFailure(
+                    "regex_miss", "Could not extract JS variables from freethemesy"
+                )
+            return js_vars
+
+        tokens = await _hop(
+            flow, "movie_page", urlparse(url).hostname or "", movie_page
         )
-        ss_match = re.search("var sss = '(.*?)'; var", response.text)
-        fetch_match = re.search("_0x12fb2a=(.*?);_0x3073", response.text)
-        if not ss_match or not fetch_match:
-            logger.warning("Could not extract JS variables from freethemesy")
-            return []
-        ss = ss_match.group(1)
-        fetch_str_list = ast.literal_eval(fetch_match.group(1))
+        tokens = await _hop(flow, "technews24_blog", TECHNEWS24_HOST, technews24_blog)
+        tokens = await _hop(flow, "freethemesy_dld", FREETHEMESY_HOST, freethemesy_dld)
+        ss = tokens["sss"]
+        fetch_str_list = ast.literal_eval(tokens["fetch"])
         v = fetch_str_list[18]
         final_url = "https://freethemesy.com/new/l/api/m"
         payload = {"s": ss, "v": v}
@@ -195,77 +434,179 @@ def get_download_links(url: str) -> list[dict]:
             "X-Requested-With": "XMLHttpRequest",
             "Content-Type": "application/x-www-form-urlencoded",
         }
-        final_response_down_page = requests.post(
-            final_url, data=payload, headers=headers, timeout=TIMEOUT
-        ).text.strip()
-        response = local_session.get(final_response_down_page, timeout=TIMEOUT)
-        soup = BeautifulSoup(response.text, "html.parser")
-        links = extract_all_links(response.text)
-        filtered_links = []
-        if isinstance(links, list):
-            for item in links:
-                if isinstance(item, dict) and "links" in item:
-                    item["links"] = [
-                        l for l in item["links"] if ".me" not in l.get("url", "")
-                    ]
-                    if item["links"]:
-                        filtered_links.append(item)
-                elif isinstance(item, dict) and "link" in item:
-                    if ".me" not in item["link"]:
-                        filtered_links.append(item)
-                elif isinstance(item, dict) and "url" in item:
-                    if ".me" not in item["url"]:
-                        filtered_links.append(item)
-            return filtered_links
-        return []
-    except Exception as e:
-        logging.exception(f"Error getting download links: {e}")
-        return []
 
+        async def freethemesy_api(hop: metrics.HopTimer) -> str:
+            async with pool.client(timeout=TIMEOUT) as api_session:
+                final_response = hop.track(
+                    await api_session.post(final_url, data=payload, headers=headers)
+                )
+                final_response.raise_for_status()
+            return final_response.text.strip()
 
-def get_direct_link(url: str) -> str:
-    """Extract direct download link from the intermediate link."""
-    try:
-        local_session = requests.Session()
-        local_session.headers.update(DEFAULT_HEADERS)
-        response = local_session.get(url, timeout=TIMEOUT)
-        fu5_input = BeautifulSoup(response.text, "html.parser").find(
-            "input", {"type": "hidden", "name": "FU5"}
-        )
-        if not fu5_input:
-            return ""
-        response = local_session.post(
-            "https://sharelink-3.site/dld.php",
-            data={"FU5": fu5_input["value"]},
-            timeout=TIMEOUT,
-        )
-        fu7_input = BeautifulSoup(response.text, "html.parser").find(
-            "input", {"type": "hidden", "name": "FU7"}
+        async def final_page(hop: metrics.HopTimer) -> str:
+            response = hop.track(await local_session.get(final_response_down_page))
+            response.raise_for_status()
+            return response.text
+
+        final_response_down_page = await _hop(
+            flow, "freethemesy_api", FREETHEMESY_HOST, freethemesy_api
         )
-        if not fu7_input:
-            return ""
-        response = local_session.post(
-            "https://sharelink-3.site/blog/",
-            data={"FU7": fu7_input["value"]},
-            timeout=TIMEOUT,
+        html = await _hop(
+            flow,
+            "final_page",
+            urlparse(final_response_down_page).hostname or "",
+            final_page,
         )
-        ss_match = re.search("var sss = '(.*?)';", response.text)
-        v_match = re.search("v: '(.*?)'", response.text)
-        if not ss_match or not v_match:
-            return ""
-        sss = ss_match.group(1)
-        __v = v_match.group(1)
-        url_api = "https://sharelink-3.site/l/api/m"
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "X-Requested-With": "XMLHttpRequest",
-        }
-        payload = {"s": sss, "v": __v}
-        response = requests.post(
-            url_api, headers=headers, data=json.dumps(payload), timeout=TIMEOUT
+    return extract_all_links(html)
+
+
+def _filter_links(links: list[dict]) -> list[dict]:
+    filtered_links = []
+    if isinstance(links, list):
+        for item in links:
+            if isinstance(item, dict) and "links" in item:
+                item["links"] = [
+                    l for l in item["links"] if ".me" not in l.get("url", "")
+                ]
+                if item["links"]:
+                    filtered_links.append(item)
+            elif isinstance(item, dict) and "link" in item:
+                if ".me" not in item["link"]:
+                    filtered_links.append(item)
+            elif isinstance(item, dict) and "url" in item:
+                if ".me" not in item["url"]:
+                    filtered_links.append(item)
+    return filtered_links
+
+
+async def get_direct_link(url: str) -> str:
+    """Extract direct download link from the intermediate link."""
+    cached = cached_direct_link(url)
+    if cached is not None:
+        return cached
+    return await fetch_direct_link(url)
+
+
+async def scheduled_direct_link(url: str, priority: int = 0, tag: str = "") -> str:
+    """Direct link for ``url`` from the cache, or resolved through the shared scheduler.
+
+    The per-host limit applies to sharelink, which every direct link chain
+    goes through, not to the host of the intermediate ``url``.
+    """
+    cached = cached_direct_link(url)
+    if cached is not None:
+        return cached
+    return await resolution_scheduler.run(
+        lambda: fetch_direct_link(url),
+        host=SHARELINK_HOST,
+        priority=priority,
+        tag=tag,
+    )
+
+
+def cached_direct_link(url: str) -> str | None:
+    """Return the cached direct link for ``url`` without any network I/O."""
+    return direct_link_cache.get(url)
+
+
+async def fetch_direct_link(url: str) -> str:
+    """Resolve ``url`` upstream, sharing the work with concurrent callers."""
+    return await direct_flight.do(url, lambda: _resolve_direct_link(url))
+
+
+async def _resolve_direct_link(url: str) -> str:
+    direct = await _fetch_direct_link(url)
+    if direct.startswith("http"):
+        direct_link_cache.set(url, direct)
+    return direct
+
+
+async def _fetch_direct_link(url: str) -> str:
+    try:
+        breakers.check(urlparse(url).hostname or "", SHARELINK_HOST)
+        direct = await asyncio.wait_for(
+            _walk_direct_chain(url), config.DIRECT_LINK_DEADLINE
         )
-        return response.text
+    except UpstreamUnavailable:
+        metrics.flow_outcomes.inc(flow="direct_link", outcome="upstream_unavailable")
+        raise
+    except asyncio.TimeoutError:
+        metrics.flow_outcomes.inc(flow="direct_link", outcome="deadline_exceeded")
+        return ""
+    except HopFailure as e:
+        metrics.flow_outcomes.inc(flow="direct_link", outcome=e.reason)
+        return ""
     except Exception as e:
+        metrics.flow_outcomes.inc(flow="direct_link", outcome=metrics.classify(e))
         logging.exception(f"Error getting direct link: {e}")
-        return ""
\ No newline at end of file
+        return ""
+    metrics.flow_outcomes.inc(
+        flow="direct_link",
+        outcome="ok" if direct.startswith("http") else "bad_api_response",
+    )
+    return direct
+
+
+async def _walk_direct_chain(url: str) -> str:
+    flow = "direct_link"
+    async with pool.client(headers=DEFAULT_HEADERS, timeout=TIMEOUT) as local_session:
+
+        async def intermediate(hop: metrics.HopTimer) -> dict[str, str]:
+            async with local_session.stream("GET", url) as response:
+                hop.track(response).raise_for_status()
+                fu5 = await stream_tokens(response, inputs=("FU5",))
+            if "FU5" not in fu5:
+                hop.fail("missing_fu5")
+                raise HopFailure("missing_fu5")
+            return fu5
+
+        async def sharelink_dld(hop: metrics.HopTimer) -> dict[str, str]:
+            async with local_session.stream(
+                "POST", "https://sharelink-3.site/dld.php", data={"FU5": tokens["FU5"]}
+            ) as response:
+                hop.track(response).raise_for_status()
+                fu7 = await stream_tokens(response, inputs=("FU7",))
+            if "FU7" not in fu7:
+                hop.fail("missing_fu7")
+                raise HopFailure("missing_fu7")
+            return fu7
+
+        async def sharelink_blog(hop: metrics.HopTimer) -> dict[str, str]:
+            async with local_session.stream(
+                "POST", "https://sharelink-3.site/blog/", data={"FU7": tokens["FU7"]}
+            ) as response:
+                hop.track(response).raise_for_status()
+                js_vars = await stream_tokens(
+                    response, patterns={"sss": SSS_VAR, "v": SHARELINK_V_VAR}
+                )
+            if "sss" not in js_vars or "v" not in js_vars:
+                hop.fail("regex_miss")
+                raise HopFailure("regex_miss")
+            return js_vars
+
+        tokens = await _hop(
+            flow, "intermediate", urlparse(url).hostname or "", intermediate
+        )
+        tokens = await _hop(flow, "sharelink_dld", SHARELINK_HOST, sharelink_dld)
+        tokens = await _hop(flow, "sharelink_blog", SHARELINK_HOST, sharelink_blog)
+    sss = tokens["sss"]
+    __v = tokens["v"]
+    url_api = "https://sharelink-3.site/l/api/m"
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "X-Requested-With": "XMLHttpRequest",
+    }
+    payload = {"s": sss, "v": __v}
+
+    async def sharelink_api(hop: metrics.HopTimer) -> str:
+        async with pool.client(timeout=TIMEOUT) as api_session:
+            response = hop.track(
+                await api_session.post(
+                    url_api, headers=headers, content=json.dumps(payload)
+                )
+            )
+            response.raise_for_status()
+        return response.text
+
+    return await _hop(flow, "sharelink_api", SHARELINK_HOST, sharelink_api)
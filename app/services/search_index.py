@@ -0,0 +1,180 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from app.services import config
+
+WORD = re.compile("\\w+")
+
+
+class SearchIndex:
+    """SQLite store of movie cards with full-text search over titles.
+
+    Uses an FTS5 table when the SQLite build has it and falls back to
+    ``LIKE`` matching otherwise. Also keeps small key/value crawl state so an
+    interrupted crawl can resume. The database is opened on first use, so
+    importing this module does not touch ``path``. Queries block on SQLite;
+    call them from a worker thread (``asyncio.to_thread``) in async code.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fts = False
+        self.entries = 0
+        self.hits = 0
+        self.misses = 0
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Open the database on first use; callers hold ``_lock``."""
+        if self._db is not None:
+            return self._db
+        path = self.path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS movies (link TEXT PRIMARY KEY, title TEXT, image TEXT, seen_at REAL)"
+        )
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS crawl_state (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        try:
+            self._create_fts(db)
+            self.fts = True
+        except sqlite3.OperationalError:
+            logging.warning("SQLite has no FTS5; search index falls back to LIKE")
+            self.fts = False
+        db.commit()
+        self.entries = db.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+        self._db = db
+        return db
+
+    @staticmethod
+    def _create_fts(db: sqlite3.Connection) -> None:
+        """External-content FTS table over ``movies``, kept in sync by triggers.
+
+        Rows are keyed on the ``movies`` rowid, so replacing a title deletes
+        its old terms by rowid instead of scanning the FTS table. An index
+        from the earlier standalone layout is rebuilt once.
+        """
+        row = db.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'movies_fts'"
+        ).fetchone()
+        if row and "content=" not in row[0]:
+            db.execute("DROP TABLE movies_fts")
+            row = None
+        db.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(title, content='movies', content_rowid='rowid')"
+        )
+        db.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+                INSERT INTO movies_fts (rowid, title) VALUES (new.rowid, new.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+                INSERT INTO movies_fts (movies_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF title ON movies BEGIN
+                INSERT INTO movies_fts (movies_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+                INSERT INTO movies_fts (rowid, title) VALUES (new.rowid, new.title);
+            END;
+            """
+        )
+        if row is None:
+            db.execute("INSERT INTO movies_fts (movies_fts) VALUES ('rebuild')")
+
+    def add(self, movies: list[dict[str, str]]) -> int:
+        """Insert or update movie cards; returns how many were not indexed before."""
+        added = 0
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            for m in movies:
+                known = db.execute(
+                    "SELECT 1 FROM movies WHERE link = ?", (m["link"],)
+                ).fetchone()
+                db.execute(
+                    "INSERT INTO movies (link, title, image, seen_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (link) DO UPDATE SET title = excluded.title, "
+                    "image = excluded.image, seen_at = excluded.seen_at",
+                    (m["link"], m["title"], m["image"], now),
+                )
+                if not known:
+                    added += 1
+            db.commit()
+            self.entries += added
+        return added
+
+    def search(self, query: str, limit: int = 60) -> list[dict[str, str]]:
+        """Movies whose title contains every word of ``query``, best match first."""
+        words = WORD.findall(query.lower())
+        if not words:
+            return []
+        with self._lock:
+            db = self._conn()
+            if self.fts:
+                match = " ".join(f'"{w}"*' for w in words)
+                rows = db.execute(
+                    "SELECT m.title, m.image, m.link FROM movies_fts JOIN movies m ON m.rowid = movies_fts.rowid "
+                    "WHERE movies_fts MATCH ? ORDER BY bm25(movies_fts), m.seen_at DESC LIMIT ?",
+                    (match, limit),
+                ).fetchall()
+            else:
+                where = " AND ".join("lower(title) LIKE ?" for _ in words)
+                rows = db.execute(
+                    f"SELECT title, image, link FROM movies WHERE {where} ORDER BY seen_at DESC LIMIT ?",
+                    (*(f"%{w}%" for w in words), limit),
+                ).fetchall()
+            if rows:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return [{"title": t, "image": i, "link": l} for t, i, l in rows]
+
+    def recent(self, limit: int) -> list[dict[str, str]]:
+        """The ``limit`` most recently seen movies, oldest first."""
+        with self._lock:
+            rows = (
+                self._conn()
+                .execute(
+                    "SELECT title, image, link FROM movies ORDER BY seen_at DESC LIMIT ?",
+                    (limit,),
+                )
+                .fetchall()
+            )
+        return [{"title": t, "image": i, "link": l} for t, i, l in reversed(rows)]
+
+    def get_state(self, key: str, default: str = "") -> str:
+        with self._lock:
+            row = (
+                self._conn()
+                .execute("SELECT value FROM crawl_state WHERE key = ?", (key,))
+                .fetchone()
+            )
+        return row[0] if row else default
+
+    def set_state(self, key: str, value: str) -> None:
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO crawl_state (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+            db.commit()
+
+    def stats(self) -> dict[str, float]:
+        """Counters only; never waits for a query or opens the database."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+search_index = SearchIndex(config.SEARCH_INDEX_DB)
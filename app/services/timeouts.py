@@ -0,0 +1,104 @@
+import time
+from typing import Any, Awaitable, Callable
+import httpcore
+import httpx
+from app.services import config
+from app.services.resilience import LatencyTracker
+
+CONNECT_PHASES = ("connect_tcp", "start_tls")
+READ_PHASES = ("receive_response_headers",)
+
+
+class AdaptiveTimeouts:
+    """Per-host connect and read timeouts learned from observed latency.
+
+    The time spent connecting (TCP and TLS) and waiting for response headers
+    is recorded for every request through the httpcore ``trace`` extension.
+    Each timeout is ``multiplier`` times the host's rolling ``percentile`` of
+    that phase, clamped to its bounds; the upper bound applies until enough
+    samples are seen. A phase that times out is recorded at its timeout, so
+    the budget of a host that slows down grows back.
+    """
+
+    def __init__(
+        self,
+        percentile: float,
+        multiplier: float,
+        connect_bounds: tuple[float, float],
+        read_bounds: tuple[float, float],
+        window: int,
+        min_samples: int,
+    ):
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.connect_bounds = connect_bounds
+        self.read_bounds = read_bounds
+        self._connect = LatencyTracker(window, min_samples)
+        self._read = LatencyTracker(window, min_samples)
+        self._hosts: set[str] = set()
+
+    def _budget(
+        self, tracker: LatencyTracker, host: str, bounds: tuple[float, float]
+    ) -> float:
+        observed = tracker.percentile(host, self.percentile)
+        if observed is None:
+            return bounds[1]
+        return min(bounds[1], max(bounds[0], observed * self.multiplier))
+
+    def connect_timeout(self, host: str) -> float:
+        return self._budget(self._connect, host, self.connect_bounds)
+
+    def read_timeout(self, host: str) -> float:
+        return self._budget(self._read, host, self.read_bounds)
+
+    def timeout(self, host: str) -> httpx.Timeout:
+        read = self.read_timeout(host)
+        return httpx.Timeout(
+            read,
+            connect=self.connect_timeout(host),
+            pool=self.read_bounds[1],
+        )
+
+    def tracer(self, host: str) -> Callable[[str, dict[str, Any]], Awaitable[None]]:
+        """An httpcore ``trace`` callback recording phase latencies for ``host``."""
+        self._hosts.add(host)
+        started: dict[str, float] = {}
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            name, _, stage = event.rpartition(".")
+            phase = name.rpartition(".")[2]
+            if phase in CONNECT_PHASES:
+                tracker, budget = self._connect, self.connect_timeout
+            elif phase in READ_PHASES:
+                tracker, budget = self._read, self.read_timeout
+            else:
+                return
+            if stage == "started":
+                started[phase] = time.perf_counter()
+            elif stage == "complete" and phase in started:
+                tracker.observe(host, time.perf_counter() - started.pop(phase))
+            elif stage == "failed" and isinstance(
+                info.get("exception"), httpcore.TimeoutException
+            ):
+                tracker.observe(host, budget(host))
+
+        return trace
+
+    def budgets(self) -> dict[str, dict[str, float]]:
+        return {
+            host: {
+                "connect": self.connect_timeout(host),
+                "read": self.read_timeout(host),
+            }
+            for host in self._hosts
+        }
+
+
+adaptive_timeouts = AdaptiveTimeouts(
+    config.TIMEOUT_PERCENTILE,
+    config.TIMEOUT_MULTIPLIER,
+    (config.TIMEOUT_CONNECT_MIN, config.TIMEOUT_CONNECT_MAX),
+    (config.TIMEOUT_READ_MIN, config.TIMEOUT_READ_MAX),
+    config.TIMEOUT_WINDOW,
+    config.TIMEOUT_MIN_SAMPLES,
+)
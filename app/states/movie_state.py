@@ -1,16 +1,19 @@
 import reflex as rx
 from typing import TypedDict
-import asyncio
 import logging
-from app.services import scraper
+from app.services import config, scraper
+from app.services.batching import completed_batches
+from app.services.breaker import UpstreamUnavailable
+from app.services.feed import latest_feed
+from app.services.fuzzy import title_index
+from app.services.prefetch import prefetcher
+from app.services.scheduler import resolution_scheduler
 
 
 class LinkItem(TypedDict):
     label: str
     url: str
     subtext: str
-    direct_url: str
-    resolving: bool
 
 
 class LinkGroup(TypedDict):
@@ -22,9 +25,6 @@ class Movie(TypedDict):
     title: str
     image: str
     link: str
-    expanded: bool
-    loading_links: bool
-    links: list[LinkGroup]
 
 
 class MovieState(rx.State):
@@ -33,6 +33,54 @@ class MovieState(rx.State):
     is_loading: bool = False
     error_message: str = ""
     manual_url: str = ""
+    expanded_link: str = ""
+    loading_links: bool = False
+    link_groups: list[LinkGroup] = []
+    direct_urls: dict[str, str] = {}
+    lazy_resolution: bool = config.RESOLVE_MODE == "lazy"
+    open_groups: list[int] = []
+    resolving: list[str] = []
+    upstream_unavailable: str = ""
+    suggestions: list[Movie] = []
+    _movie_index: dict[str, int] = {}
+    _links_request: int = 0
+
+    def _set_movies(self, movies: list[Movie]):
+        """Replace the grid with a copy of ``movies``, collapsing any expanded movie.
+
+        The list may be shared (the latest feed snapshot is), so later
+        in-place changes must not reach it.
+        """
+        self.movies = list(movies)
+        self._movie_index = {m["link"]: i for i, m in enumerate(movies)}
+        self._collapse()
+
+    def _add_movies(self, movies: list[Movie]):
+        for m in movies:
+            if m["link"] not in self._movie_index:
+                self._movie_index[m["link"]] = len(self.movies)
+                self.movies.append(m)
+
+    def _tag(self, movie_link: str) -> str:
+        """Scheduler tag of this session's resolutions for ``movie_link``."""
+        return f"{self.router.session.client_token}:{movie_link}"
+
+    def _collapse(self):
+        if self.expanded_link:
+            resolution_scheduler.deprioritize(self._tag(self.expanded_link))
+        self.expanded_link = ""
+        self.loading_links = False
+        self.link_groups = []
+        self.direct_urls = {}
+        self.open_groups = []
+        self.resolving = []
+        self.upstream_unavailable = ""
+
+    def _update_direct_urls(self, batch: list[tuple[str, str, str]]):
+        for url, direct, unavailable in batch:
+            self.direct_urls[url] = direct
+            if unavailable:
+                self.upstream_unavailable = unavailable
 
     @rx.event
     def on_load(self):
@@ -45,11 +93,7 @@ class MovieState(rx.State):
         self.error_message = ""
         yield
         try:
-            results = await asyncio.to_thread(scraper.get_latest_movies)
-            self.movies = [
-                {**m, "expanded": False, "loading_links": False, "links": []}
-                for m in results
-            ]
+            self._set_movies(await latest_feed.get())
         except Exception as e:
             logging.exception(f"Error fetching latest movies: {e}")
             self.error_message = "Could not load latest movies."
@@ -63,16 +107,23 @@ class MovieState(rx.State):
             return
         self.is_loading = True
         self.error_message = ""
-        self.movies = []
+        self.suggestions = []
+        self._set_movies([])
         yield
         try:
-            results = await asyncio.to_thread(scraper.search_movie, self.search_query)
-            self.movies = [
-                {**m, "expanded": False, "loading_links": False, "links": []}
-                for m in results
-            ]
-            if not results:
+            async for batch in scraper.search_pages(self.search_query):
+                self._add_movies(batch)
+                self.is_loading = False
+                yield
+            if not self.movies:
+                self._add_movies(title_index.suggest(self.search_query, limit=24))
+                if self.movies:
+                    yield rx.toast.info("No exact matches; showing similar titles.")
+            if not self.movies:
                 self.error_message = "No movies found. Try a different search term."
+            prefetcher.record_search(
+                self.search_query, [m["link"] for m in self.movies]
+            )
         except Exception as e:
             logging.exception(f"Error searching movies: {e}")
             self.error_message = f"An error occurred while searching: {str(e)}"
@@ -82,6 +133,17 @@ class MovieState(rx.State):
     @rx.event
     def set_search_query(self, value: str):
         self.search_query = value
+        self.suggestions = title_index.suggest(value) if len(value.strip()) >= 2 else []
+
+    @rx.event
+    def select_suggestion(self, movie_link: str):
+        """Show a suggested movie on its own and open its links."""
+        for m in self.suggestions:
+            if m["link"] == movie_link:
+                self.suggestions = []
+                self.error_message = ""
+                self._set_movies([m])
+                return MovieState.toggle_movie_expand(movie_link)
 
     @rx.event
     def handle_key_down(self, key: str):
@@ -91,145 +153,182 @@ class MovieState(rx.State):
     @rx.var
     def displayed_movies(self) -> list[Movie]:
         """Return only the expanded movie if one exists, otherwise all movies."""
-        for m in self.movies:
-            if m["expanded"]:
-                return [m]
+        idx = self._movie_index.get(self.expanded_link)
+        if idx is not None:
+            return [self.movies[idx]]
         return self.movies
 
     @rx.event
     def toggle_movie_expand(self, movie_link: str):
         """Toggle expanded state for a movie and fetch links if needed."""
-        target_movie = None
-        for m in self.movies:
-            if m["link"] == movie_link:
-                target_movie = m
-                break
-        if not target_movie:
+        if movie_link not in self._movie_index:
             return
-        should_expand = not target_movie["expanded"]
-        new_movies = []
-        for m in self.movies:
-            m_copy = m.copy()
-            if m["link"] == movie_link:
-                m_copy["expanded"] = should_expand
-            elif should_expand:
-                m_copy["expanded"] = False
-            new_movies.append(m_copy)
-        self.movies = new_movies
-        if (
-            should_expand
-            and (not target_movie["links"])
-            and (not target_movie["loading_links"])
-        ):
+        should_expand = self.expanded_link != movie_link
+        self._collapse()
+        if should_expand:
+            self.expanded_link = movie_link
+            resolution_scheduler.restore(self._tag(movie_link))
             return MovieState.fetch_links_for_movie(movie_link)
 
     async def _resolve_link(
-        self, url: str, g_idx: int, i_idx: int
-    ) -> tuple[int, int, str]:
+        self, url: str, priority: int, tag: str
+    ) -> tuple[str, str, str]:
+        """Resolve ``url``; returns (url, direct link, upstream unavailable message)."""
         try:
-            direct = await asyncio.to_thread(scraper.get_direct_link, url)
-            return (g_idx, i_idx, direct)
+            direct = await scraper.scheduled_direct_link(url, priority, tag)
+            return (url, direct, "")
+        except UpstreamUnavailable as e:
+            return (url, "", str(e))
         except Exception as e:
             logging.exception(f"Error resolving link {url}: {e}")
-            return (g_idx, i_idx, "")
+            return (url, "", "")
 
     @rx.event
-    async def fetch_links_for_movie(self, movie_link: str):
-        idx = -1
-        for i, m in enumerate(self.movies):
-            if m["link"] == movie_link:
-                idx = i
-                break
-        if idx == -1:
+    def refresh_links(self, movie_link: str):
+        """Discard the cached link groups of a movie and fetch them again."""
+        if movie_link != self.expanded_link or self.loading_links:
             return
-        self.movies[idx]["loading_links"] = True
-        yield
-        try:
-            raw_links = await asyncio.to_thread(scraper.get_download_links, movie_link)
-            normalized: list[LinkGroup] = []
-            for item in raw_links:
-                if "links" in item:
-                    group_items = []
-                    for sub in item["links"]:
-                        group_items.append(
-                            {
-                                "label": sub.get("label") or sub.get("type", "Link"),
-                                "url": sub.get("url") or sub.get("link", ""),
-                                "subtext": sub.get("type", ""),
-                                "direct_url": "",
-                                "resolving": True,
-                            }
-                        )
-                    normalized.append(
-                        {"group": item.get("title", "Links"), "items": group_items}
-                    )
-                else:
-                    normalized.append(
-                        {
-                            "group": item.get("quality", "Download"),
-                            "items": [
-                                {
-                                    "label": item.get("type", "Link"),
-                                    "url": item.get("link") or item.get("url", ""),
-                                    "subtext": "",
-                                    "direct_url": "",
-                                    "resolving": True,
-                                }
-                            ],
-                        }
-                    )
-            current_idx = -1
-            for i, m in enumerate(self.movies):
-                if m["link"] == movie_link:
-                    current_idx = i
-                    break
-            if current_idx != -1:
-                self.movies[current_idx]["links"] = normalized
-                self.movies[current_idx]["loading_links"] = False
-            yield
-            tasks = []
-            for g_idx, group in enumerate(normalized):
-                for i_idx, item in enumerate(group["items"]):
-                    tasks.append(self._resolve_link(item["url"], g_idx, i_idx))
-            if not tasks:
+        return MovieState.fetch_links_for_movie(movie_link, True)
+
+    @rx.event(background=True)
+    async def fetch_links_for_movie(self, movie_link: str, refresh: bool = False):
+        """Load the link groups of the expanded movie and, in eager mode, resolve them.
+
+        Runs in the background so collapsing or expanding another card is not
+        blocked by the upstream chains.
+        """
+        async with self:
+            if movie_link != self.expanded_link:
                 return
-            for coro in asyncio.as_completed(tasks):
-                g_idx, i_idx, direct_url = await coro
-                m_idx = -1
-                for k, m in enumerate(self.movies):
-                    if m["link"] == movie_link:
-                        m_idx = k
-                        break
-                if m_idx != -1:
-                    self.movies[m_idx]["links"][g_idx]["items"][i_idx]["resolving"] = (
-                        False
-                    )
-                    if direct_url:
-                        self.movies[m_idx]["links"][g_idx]["items"][i_idx][
-                            "direct_url"
-                        ] = direct_url
-                    yield
+            self._links_request += 1
+            request = self._links_request
+            tag = self._tag(movie_link)
+            self.loading_links = True
+            self.link_groups = []
+            self.direct_urls = {}
+            self.open_groups = []
+            self.resolving = []
+            self.upstream_unavailable = ""
+        try:
+            groups = await scraper.get_download_links(movie_link, refresh)
+        except UpstreamUnavailable as e:
+            async with self:
+                if self._is_current(movie_link, request):
+                    self.upstream_unavailable = str(e)
+                    self.loading_links = False
+            return
         except Exception as e:
             logging.exception(f"Error fetching links for {movie_link}: {e}")
+            async with self:
+                if self._is_current(movie_link, request):
+                    self.loading_links = False
             yield rx.toast.error(f"Failed to fetch links: {e}")
-            idx_err = -1
-            for i, m in enumerate(self.movies):
-                if m["link"] == movie_link:
-                    idx_err = i
-                    break
-            if idx_err != -1:
-                self.movies[idx_err]["loading_links"] = False
+            return
+        normalized: list[LinkGroup] = [
+            {
+                "group": group["title"],
+                "items": [
+                    {
+                        "label": link["label"] or link["type"] or "Link",
+                        "url": link["url"],
+                        "subtext": link["type"],
+                    }
+                    for link in group["links"]
+                ],
+            }
+            for group in groups
+        ]
+        async with self:
+            if not self._is_current(movie_link, request):
+                return
+            self.link_groups = normalized
+            self.loading_links = False
+            lazy = self.lazy_resolution
+            if lazy:
+                for group in normalized:
+                    for item in group["items"]:
+                        direct = scraper.cached_direct_link(item["url"])
+                        if direct is not None:
+                            self.direct_urls[item["url"]] = direct
+                pending = []
+            else:
+                pending = [
+                    (item["url"], g_idx)
+                    for g_idx, group in enumerate(normalized)
+                    for item in group["items"]
+                ]
+                self.resolving = [url for url, _ in pending]
+        if lazy:
+            if len(normalized) == 1:
+                yield MovieState.toggle_group(0)
+            return
+        await self._resolve_pending(movie_link, request, tag, pending)
+
+    def _is_current(self, movie_link: str, request: int) -> bool:
+        """Whether ``movie_link`` is still expanded by the same link request."""
+        return movie_link == self.expanded_link and request == self._links_request
+
+    async def _resolve_pending(
+        self, movie_link: str, request: int, tag: str, pending: list[tuple[str, int]]
+    ):
+        """Resolve ``(url, priority)`` pairs, flushing results to the state in batches."""
+        tasks = [self._resolve_link(url, priority, tag) for url, priority in pending]
+        async for batch in completed_batches(
+            tasks, config.UI_FLUSH_INTERVAL, config.UI_FLUSH_MAX_ITEMS
+        ):
+            async with self:
+                if not self._is_current(movie_link, request):
+                    continue
+                self._update_direct_urls(batch)
+                done = {url for url, _, _ in batch}
+                self.resolving = [u for u in self.resolving if u not in done]
+
+    @rx.event
+    def toggle_group(self, g_idx: int):
+        """Open or close a link group; opening it resolves its links in lazy mode."""
+        if not self.lazy_resolution:
+            return
+        if g_idx in self.open_groups:
+            self.open_groups.remove(g_idx)
+            return
+        if g_idx >= len(self.link_groups):
+            return
+        self.open_groups.append(g_idx)
+        urls = [item["url"] for item in self.link_groups[g_idx]["items"]]
+        return MovieState.resolve_links(urls, g_idx)
+
+    @rx.event
+    def resolve_link(self, url: str):
+        return MovieState.resolve_links([url], 0)
+
+    @rx.event(background=True)
+    async def resolve_links(self, urls: list[str], priority: int):
+        """Resolve the given links of the expanded movie on demand."""
+        async with self:
+            movie_link = self.expanded_link
+            request = self._links_request
+            tag = self._tag(movie_link)
+            urls = [
+                u for u in urls if u not in self.direct_urls and u not in self.resolving
+            ]
+            self.resolving.extend(urls)
+        if urls:
+            await self._resolve_pending(
+                movie_link, request, tag, [(url, priority) for url in urls]
+            )
 
     @rx.event
     async def generate_direct_link(self, url: str):
         yield rx.toast.info("Generating direct link... This may take a few seconds.")
         try:
-            direct_link = await asyncio.to_thread(scraper.get_direct_link, url)
+            direct_link = await scraper.get_direct_link(url)
             if direct_link and direct_link.startswith("http"):
                 yield rx.set_clipboard(direct_link)
                 yield rx.toast.success("Direct link copied to clipboard!")
             else:
                 yield rx.toast.error("Could not generate direct link.")
+        except UpstreamUnavailable as e:
+            yield rx.toast.warning(str(e))
         except Exception as e:
             logging.exception(f"Error generating direct link: {e}")
             yield rx.toast.error(f"Error: {e}")
@@ -247,19 +346,14 @@ class MovieState(rx.State):
     def handle_manual_fetch(self):
         if not self.manual_url:
             return rx.toast.warning("Please enter a valid URL")
-        updated_movies = []
-        for m in self.movies:
-            m_copy = m.copy()
-            m_copy["expanded"] = False
-            updated_movies.append(m_copy)
         manual_movie: Movie = {
             "title": "Manual Fetch Result",
             "image": "/placeholder.svg",
             "link": self.manual_url,
-            "expanded": True,
-            "loading_links": True,
-            "links": [],
         }
-        updated_movies.insert(0, manual_movie)
-        self.movies = updated_movies
-        return MovieState.fetch_links_for_movie(self.manual_url)
\ No newline at end of file
+        self._set_movies(
+            [manual_movie] + [m for m in self.movies if m["link"] != self.manual_url]
+        )
+        self.expanded_link = self.manual_url
+        resolution_scheduler.restore(self._tag(self.manual_url))
+        return MovieState.fetch_links_for_movie(self.manual_url)
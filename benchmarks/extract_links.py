@@ -0,0 +1,148 @@
+"""Benchmark extract_all_links on synthetic season-pack pages.
+
+Compares the single-pass extractor with the previous sibling-walking
+implementation, checks that both return the same groups, and prints the
+time per episode block. Both parse with the configured backend
+(``SCRAPER_HTML_PARSER``), so only the extraction differs.
+
+Two layouts are generated. In ``headed`` every episode block starts with a
+``<p>`` group heading, where the legacy sibling walk stops. In ``runs`` the
+episode headings are ``<span>``/``<strong>`` siblings that do not stop it, so
+every heading walks to the end of the page: the quadratic case. There a
+heading's group also holds the links of every later block, so the returned
+link count (``links``) grows quadratically with either extractor.
+
+    python -m benchmarks.extract_links --sizes 125 250 500 1000 --layout runs
+"""
+
+import argparse
+import time
+from app.services import parsing
+from app.services.scraper import extract_all_links
+
+
+def legacy_extract_all_links(html: str) -> list[dict]:
+    soup = parsing.make_soup(html)
+    results = []
+    for tag in soup.find_all(["h2", "p", "strong", "em", "span"]):
+        text = tag.get_text(strip=True)
+        if (
+            any((keyword in text.lower() for keyword in ["epi", "batch", "part"]))
+            or tag.name == "h2"
+        ):
+            title = text
+            links = []
+            next_sibling = tag.find_next_sibling()
+            while next_sibling:
+                if next_sibling.name in ["h2", "p"] and any(
+                    (
+                        kw in next_sibling.get_text().lower()
+                        for kw in ["epi", "batch", "part"]
+                    )
+                ):
+                    break
+                if next_sibling.name == "ul":
+                    for li in next_sibling.find_all("li"):
+                        label_parts = li.get_text(strip=True).split(":")
+                        label = label_parts[0] if label_parts else "Link"
+                        for a in li.find_all("a"):
+                            links.append(
+                                {
+                                    "label": label,
+                                    "type": a.get_text(strip=True),
+                                    "url": a["href"],
+                                }
+                            )
+                next_sibling = next_sibling.find_next_sibling()
+            if links:
+                results.append({"title": title, "links": links})
+    return results
+
+
+def synthetic_page(episodes: int) -> str:
+    """Episode blocks each led by a ``<p><strong>Episode N</strong></p>`` heading."""
+    parts = ["<html><body><div class='entry-content'>", "<h2>Download Links</h2>"]
+    for i in range(1, episodes + 1):
+        if i % 50 == 1:
+            parts.append(f"<h2>Season Block {i // 50 + 1}</h2>")
+        parts.append(f"<p><strong>Episode {i:03d}</strong> <em>WEB-DL</em></p>")
+        parts.append("<div class='ad'>sponsored</div>")
+        parts.append(
+            "<ul>"
+            f"<li>480p 250MB: <a href='https://link.example/{i}/480/a'>GDrive</a>"
+            f" <a href='https://link.example/{i}/480/b'>Mega</a></li>"
+            f"<li>720p 800MB: <a href='https://link.example/{i}/720/a'>GDrive</a></li>"
+            "</ul>"
+        )
+        if i % 7 == 0:
+            parts.append(
+                f"<span>Part {i}</span><ul><li>1080p: <a href='https://link.example/{i}/1080'>One</a></li></ul>"
+            )
+    parts.append("<p><strong>Batch</strong></p>")
+    parts.append("<ul><li>Zip: <a href='https://link.example/batch'>Pack</a></li></ul>")
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def heading_runs_page(episodes: int) -> str:
+    """Episode blocks led by sibling ``<span>``/``<strong>`` headings."""
+    parts = ["<html><body><div class='entry-content'>", "<h2>Download Links</h2>"]
+    for i in range(1, episodes + 1):
+        tag = "span" if i % 2 else "strong"
+        parts.append(f"<{tag}>Episode {i:03d}</{tag}>")
+        parts.append("<p>WEB-DL x264 ESubs</p>")
+        parts.append(
+            f"<ul><li>720p 800MB: <a href='https://link.example/{i}/720'>GDrive</a></li></ul>"
+        )
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+LAYOUTS = {"headed": synthetic_page, "runs": heading_runs_page}
+
+
+def timed(fn, html: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[125, 250, 500, 1000])
+    parser.add_argument(
+        "--layout", choices=[*LAYOUTS, "all"], default="all", help="page layout"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--skip-legacy", action="store_true", help="only time the new extractor"
+    )
+    args = parser.parse_args()
+    layouts = list(LAYOUTS) if args.layout == "all" else [args.layout]
+    print(f"backend: {parsing.PARSER}")
+    print(
+        f"{'layout':<7} {'episodes':>8} {'links':>8} {'single-pass':>12} {'us/ep':>8}"
+        f" {'legacy':>10} {'us/ep':>8}"
+    )
+    for layout in layouts:
+        for size in args.sizes:
+            html = LAYOUTS[layout](size)
+            groups = extract_all_links(html)
+            links = sum(len(g.get("links", ())) for g in groups)
+            new = timed(extract_all_links, html, args.repeat)
+            row = f"{layout:<7} {size:>8} {links:>8} {new:>11.3f}s {new / size * 1e6:>8.1f}"
+            if not args.skip_legacy:
+                if groups != legacy_extract_all_links(html):
+                    raise SystemExit(
+                        f"output mismatch on {layout} with {size} episodes"
+                    )
+                old = timed(legacy_extract_all_links, html, args.repeat)
+                row += f" {old:>9.3f}s {old / size * 1e6:>8.1f}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
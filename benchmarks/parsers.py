@@ -0,0 +1,127 @@
+"""Compare the configured parser backend against full html.parser trees.
+
+Every scraper parse step is run twice on synthetic pages: once with the
+original approach (full ``html.parser`` tree) and once through
+``app.services.parsing`` (lxml where available, SoupStrainer-restricted,
+or the soup-free TokenScanner for hop tokens). The outputs must be
+identical; timings are printed side by side. Parity on the recorded
+fixture pages is checked by ``benchmarks/test_parsers.py``.
+
+    python -m benchmarks.parsers --repeat 20
+"""
+
+import argparse
+import time
+from contextlib import contextmanager
+from bs4 import BeautifulSoup
+from app.services import parsing, scraper
+from app.services.parsing import TokenScanner
+from benchmarks.extract_links import synthetic_page
+
+
+def listing_page(items: int = 24) -> str:
+    noise = "".join(
+        f"<li class='menu-item'><a href='https://fojik.com/genre/{i}/'>Genre {i}</a></li>"
+        for i in range(200)
+    )
+    articles = "".join(
+        f"<article class='item movies'><div class='poster'>"
+        f"<img src='https://fojik.com/wp-content/{i}.jpg' alt='Poster {i}'>"
+        f"<a href='https://fojik.com/movie-{i}/'><div class='see'></div></a></div>"
+        f"<div class='data'><h3>Movie {i} (2024) 720p WEB-DL Dual Audio</h3>"
+        f"<span>2024</span></div></article>"
+        for i in range(items)
+    )
+    script = "<script>" + "var x = 1;" * 2000 + "</script>"
+    return (
+        f"<html><head>{script}</head><body><nav><ul>{noise}</ul></nav>"
+        f"<div class='items'>{articles}</div><aside><ul>{noise}</ul></aside></body></html>"
+    )
+
+
+def hop_page() -> str:
+    filler = "<p>" + "Please wait while we prepare your link. " * 200 + "</p>"
+    return (
+        f"<html><body>{filler}<form method='post'>"
+        "<input type='hidden' name='FU' value='a1b2c3'>"
+        "<input type='hidden' name='FN' value='Movie.2024.720p.mkv'>"
+        "<input type='hidden' name='FU2' value='d4e5f6'>"
+        "<input type='hidden' name='FU5' value='g7h8i9'>"
+        "<input type='hidden' name='FU7' value='j0k1l2'>"
+        "<input type='hidden' name='FU8' value='&lt;decoy&gt;'>"
+        f"<input type='submit' value='Continue'></form>{filler}</body></html>"
+    )
+
+
+HOP_INPUTS = ("FU", "FN", "FU2", "FU5", "FU7", "FU8")
+
+
+def soup_hidden_inputs(html: str) -> dict[str, str]:
+    soup = BeautifulSoup(html, "html.parser")
+    found = {}
+    for name in HOP_INPUTS:
+        tag = soup.find("input", {"type": "hidden", "name": name})
+        if tag:
+            found[name] = tag["value"]
+    return found
+
+
+def scanned_hidden_inputs(html: str, chunk_size: int = 4096) -> dict[str, str]:
+    scanner = TokenScanner(HOP_INPUTS)
+    for start in range(0, len(html), chunk_size):
+        scanner.feed(html[start : start + chunk_size])
+        if scanner.done:
+            break
+    return scanner.found
+
+
+@contextmanager
+def full_html_parser():
+    def reference(html, parse_only=None):
+        return BeautifulSoup(html, "html.parser")
+
+    original = parsing.make_soup
+    parsing.make_soup = scraper.make_soup = reference
+    try:
+        yield
+    finally:
+        parsing.make_soup = scraper.make_soup = original
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    listing, hop, season = listing_page(), hop_page(), synthetic_page(200)
+    cases = {
+        "movie items": (lambda: scraper._parse_movie_items(listing), None),
+        "hidden inputs": (
+            lambda: soup_hidden_inputs(hop),
+            lambda: scanned_hidden_inputs(hop),
+        ),
+        "link groups": (lambda: scraper.extract_all_links(season), None),
+    }
+    print(f"backend: {parsing.PARSER}")
+    print(f"{'step':<14} {'html.parser':>12} {'configured':>12} {'speedup':>8}")
+    for name, (reference, configured) in cases.items():
+        configured = configured or reference
+        with full_html_parser():
+            expected = reference()
+            baseline = timed(reference, args.repeat)
+        if configured() != expected:
+            raise SystemExit(f"{name}: output differs from html.parser")
+        current = timed(configured, args.repeat)
+        print(
+            f"{name:<14} {baseline * 1e3:>10.2f}ms {current * 1e3:>10.2f}ms {baseline / current:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Offline benchmark of the scraper entry points against the local stub upstream.
+
+Starts ``benchmarks.stub_server`` (or uses ``--upstream``), points the
+scraper at it and drives ``search_movie``, ``get_latest_movies``,
+``get_download_links`` and ``get_direct_link`` with a fixed concurrency.
+Every call uses a fresh key so caches do not hide upstream work. Reports
+throughput, p50/p95/p99 latency and peak traced memory per function, and
+can write the results as JSON and compare them with an earlier run. Calls
+failed fast by an open circuit breaker count as errors and are also shown
+in the ``open`` column.
+
+    python -m benchmarks.run --requests 200 --concurrency 20 --latency 0.02 \\
+        --output bench.json --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+FUNCTIONS = (
+    "search_movie",
+    "get_latest_movies",
+    "get_download_links",
+    "get_direct_link",
+)
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "peak_memory_kb")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def make_call(scraper, name: str, run_id: str, i: int):
+    if name == "search_movie":
+        return scraper.search_movie(f"bench {run_id} {i}")
+    if name == "get_latest_movies":
+        return scraper.get_latest_movies()
+    if name == "get_download_links":
+        return scraper.get_download_links(f"https://fojik.com/bench-{run_id}-{i}/")
+    return scraper.get_direct_link(f"https://fastlinks.example/go/bench-{run_id}-{i}")
+
+
+async def drive(scraper, name: str, run_id: str, requests: int, concurrency: int):
+    from app.services.breaker import UpstreamUnavailable
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors, unavailable = [], 0, 0
+
+    async def one(i: int):
+        nonlocal errors, unavailable
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await make_call(scraper, name, run_id, i)
+            except UpstreamUnavailable:
+                result = None
+                unavailable += 1
+            latencies.append(time.perf_counter() - start)
+            if not result:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies, errors, unavailable, time.perf_counter() - start
+
+
+async def benchmark(scraper, name: str, args) -> dict:
+    run_id = f"{int(time.time() * 1000)}"
+    latencies, errors, unavailable, elapsed = await drive(
+        scraper, name, run_id, args.requests, args.concurrency
+    )
+    tracemalloc.start()
+    await drive(
+        scraper, name, f"{run_id}-mem", min(args.requests, 50), args.concurrency
+    )
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "requests": args.requests,
+        "errors": errors,
+        "unavailable": unavailable,
+        "throughput_rps": args.requests / elapsed,
+        "mean_ms": sum(latencies) / len(latencies) * 1e3,
+        "p50_ms": percentile(latencies, 50) * 1e3,
+        "p95_ms": percentile(latencies, 95) * 1e3,
+        "p99_ms": percentile(latencies, 99) * 1e3,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def print_results(results: dict, baseline: dict | None) -> None:
+    print(
+        f"{'function':<20}"
+        + "".join(f"{m:>16}" for m in METRICS)
+        + f"{'errors':>8}{'open':>8}"
+    )
+    for name, row in results.items():
+        line = f"{name:<20}"
+        for metric in METRICS:
+            cell = f"{row[metric]:.1f}"
+            old = (baseline or {}).get(name, {}).get(metric)
+            if old:
+                cell += f" ({(row[metric] - old) / old:+.0%})"
+            line += f"{cell:>16}"
+        print(line + f"{row['errors']:>8}{row.get('unavailable', 0):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100, help="calls per function")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--functions", nargs="+", choices=FUNCTIONS, default=FUNCTIONS)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--stall", type=float, default=5.0)
+    parser.add_argument("--chunked", action="store_true")
+    parser.add_argument("--upstream", help="use an already running stub server")
+    parser.add_argument("--output", help="write machine-readable results here")
+    parser.add_argument("--compare", help="previous --output file to diff against")
+    args = parser.parse_args()
+
+    if args.upstream:
+        upstream = args.upstream
+    else:
+        from benchmarks import stub_server
+
+        server, _ = stub_server.start(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            stall_rate=args.stall_rate,
+            stall=args.stall,
+            chunked=args.chunked,
+        )
+        upstream = f"http://127.0.0.1:{server.server_port}"
+    os.environ["SCRAPER_UPSTREAM_OVERRIDE"] = upstream
+    os.environ["SCRAPER_SEARCH_INDEX_DB"] = ":memory:"
+    from app.services import scraper
+
+    async def run_all():
+        return {name: await benchmark(scraper, name, args) for name in args.functions}
+
+    results = asyncio.run(run_all())
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": time.time(),
+                "python": platform.python_version(),
+                "upstream": upstream,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "latency": args.latency,
+                "jitter": args.jitter,
+                "error_rate": args.error_rate,
+                "stall_rate": args.stall_rate,
+                "chunked": args.chunked,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
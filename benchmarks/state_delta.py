@@ -0,0 +1,187 @@
+"""Measure the state delta sent to the browser per resolved direct link.
+
+A MovieState is driven through ``fetch_links_for_movie`` against the stub
+upstream chain, and the JSON size of the delta produced each time the
+background handler leaves ``async with self`` is recorded; resolutions are flushed in batches per SCRAPER_UI_FLUSH_INTERVAL
+and SCRAPER_UI_FLUSH_MAX_ITEMS. The same resolutions are replayed on a model
+of the previous state layout, where every movie carried its nested link
+groups and each single result re-sent the whole ``movies`` list plus
+``displayed_movies``.
+
+    python -m benchmarks.state_delta --movies 24
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+from types import MethodType
+from typing import TypedDict
+import reflex as rx
+from reflex.state import State
+from reflex.utils import format
+from benchmarks import stub_server
+
+
+class LegacyLinkItem(TypedDict):
+    label: str
+    url: str
+    subtext: str
+    direct_url: str
+    resolving: bool
+
+
+class LegacyLinkGroup(TypedDict):
+    group: str
+    items: list[LegacyLinkItem]
+
+
+class LegacyMovie(TypedDict):
+    title: str
+    image: str
+    link: str
+    expanded: bool
+    loading_links: bool
+    links: list[LegacyLinkGroup]
+
+
+class LegacyMovieState(rx.State):
+    movies: list[LegacyMovie] = []
+
+    @rx.var
+    def displayed_movies(self) -> list[LegacyMovie]:
+        for m in self.movies:
+            if m["expanded"]:
+                return [m]
+        return self.movies
+
+
+def delta_bytes(root: State) -> int:
+    size = len(format.json_dumps(root.get_delta()))
+    root._clean()
+    return size
+
+
+class DeltaRecorder:
+    """Stands in for a background task's StateProxy, recording each flushed delta."""
+
+    def __init__(self, state: State, root: State, sizes: list[int]):
+        object.__setattr__(self, "_recorded", (state, root, sizes))
+
+    def __getattr__(self, name: str):
+        value = getattr(self._recorded[0], name)
+        if isinstance(value, MethodType):
+            return MethodType(value.__func__, self)
+        return value
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._recorded[0], name, value)
+
+    async def __aenter__(self) -> "DeltaRecorder":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        _, root, sizes = self._recorded
+        sizes.append(delta_bytes(root))
+
+
+async def current_deltas(
+    root: State, movies: list[dict], link: str
+) -> tuple[list[int], list, dict]:
+    from app.states.movie_state import MovieState
+
+    state = root.get_substate(MovieState.get_full_name().split(".")[1:])
+    state._set_movies(movies)
+    state.expanded_link = link
+    delta_bytes(root)
+    sizes = []
+    handler = MovieState.event_handlers["fetch_links_for_movie"].fn
+    async for _ in handler(DeltaRecorder(state, root, sizes), link):
+        pass
+    return sizes, state.link_groups, state.direct_urls
+
+
+def legacy_deltas(
+    root: State, movies: list[dict], link: str, groups: list, resolved: dict
+) -> list[int]:
+    state = root.get_substate(LegacyMovieState.get_full_name().split(".")[1:])
+    state.movies = [
+        {**m, "expanded": m["link"] == link, "loading_links": False, "links": []}
+        for m in movies
+    ]
+    delta_bytes(root)
+    idx = next(i for i, m in enumerate(state.movies) if m["link"] == link)
+    state.movies[idx]["loading_links"] = True
+    sizes = [delta_bytes(root)]
+    state.movies[idx]["links"] = [
+        {
+            "group": g["group"],
+            "items": [
+                {**item, "direct_url": "", "resolving": True} for item in g["items"]
+            ],
+        }
+        for g in groups
+    ]
+    state.movies[idx]["loading_links"] = False
+    sizes.append(delta_bytes(root))
+    for url, direct in resolved.items():
+        for group in state.movies[idx]["links"]:
+            for item in group["items"]:
+                if item["url"] == url:
+                    item["resolving"] = False
+                    item["direct_url"] = direct
+        sizes.append(delta_bytes(root))
+    return sizes
+
+
+def summarize(name: str, sizes: list[int]):
+    per_resolution = sizes[2:]
+    print(
+        f"{name:<8} {len(per_resolution):>6} {statistics.mean(per_resolution):>10.0f} "
+        f"{max(per_resolution):>10} {sum(sizes):>12}"
+    )
+    return sum(sizes)
+
+
+async def run(args):
+    # Imported here so the environment is set before app.services reads config.
+    from app.states.movie_state import MovieState  # noqa: F401
+
+    root = State(_reflex_internal_init=True)
+    movies = [
+        {
+            "title": f"Movie {i} (2024) 720p WEB-DL",
+            "image": f"https://fojik.com/wp-content/uploads/{i}.jpg",
+            "link": f"https://fojik.com/movie-{i}/",
+        }
+        for i in range(args.movies)
+    ]
+    link = movies[0]["link"]
+    current, groups, resolved = await current_deltas(root, movies, link)
+    legacy = legacy_deltas(root, movies, link, groups, resolved)
+    print(f"{args.movies} movies, {len(resolved)} links")
+    print(
+        f"{'layout':<8} {'deltas':>6} {'avg bytes':>10} {'max bytes':>10} {'total bytes':>12}"
+    )
+    before = summarize("legacy", legacy)
+    after = summarize("indexed", current)
+    print(f"total payload reduced {before / after:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movies", type=int, default=24)
+    args = parser.parse_args()
+    server, _ = stub_server.start(port=0)
+    os.environ["SCRAPER_UPSTREAM_OVERRIDE"] = (
+        f"http://127.0.0.1:{server.server_address[1]}"
+    )
+    os.environ["SCRAPER_SEARCH_INDEX_DB"] = ":memory:"
+    try:
+        asyncio.run(run(args))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Local stand-in for the fojik -> technews24 -> freethemesy -> sharelink chain.
+
+Replays the fixture pages in ``benchmarks/fixtures`` for every hop used by
+the scraper. Requests are routed by their Host header, so the scraper can
+be pointed at it with ``SCRAPER_UPSTREAM_OVERRIDE=http://127.0.0.1:<port>``.
+Each fixture may contain ``{id}``, which is replaced by an identifier that
+is carried through the chain via the posted tokens, so every movie and
+link resolves to a distinct result. With ``--chunked`` replies are sent
+with ``Transfer-Encoding: chunked`` instead of a ``Content-Length``, as
+PHP and Cloudflare pages usually are.
+
+    python -m benchmarks.stub_server --port 8765 --latency 0.05 --error-rate 0.02 \\
+        --stall-rate 0.01 --stall 5 --chunked
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = Path(__file__).parent / "fixtures"
+CHUNK_SIZE = 4096
+ROUTES = [
+    ("fojik.com", "GET", re.compile("^/(page/\\d+/)?$"), None),
+    ("fojik.com", "GET", re.compile("^/(?P<id>[^/]+)/$"), "movie_page.html"),
+    (
+        "search.technews24.site",
+        "POST",
+        re.compile("^/blog\\.php$"),
+        "technews24_blog.html",
+    ),
+    ("freethemesy.com", "POST", re.compile("^/dld\\.php$"), "freethemesy_dld.html"),
+    ("freethemesy.com", "POST", re.compile("^/new/l/api/m$"), "freethemesy_api.txt"),
+    (
+        "freethemesy.com",
+        "GET",
+        re.compile("^/links/(?P<id>[^/]+)$"),
+        "final_links.html",
+    ),
+    ("sharelink-3.site", "POST", re.compile("^/dld\\.php$"), "sharelink_dld.html"),
+    ("sharelink-3.site", "POST", re.compile("^/blog/$"), "sharelink_blog.html"),
+    ("sharelink-3.site", "POST", re.compile("^/l/api/m$"), "sharelink_api.txt"),
+    (None, "GET", re.compile("^/go/(?P<id>[^/]+)$"), "intermediate.html"),
+]
+
+
+class StubConfig:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        stall_rate: float = 0.0,
+        stall: float = 5.0,
+        chunked: bool = False,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.chunked = chunked
+        self.requests = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    stub: StubConfig
+    fixtures: dict[str, str] = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle("GET", "")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._handle("POST", self.rfile.read(length).decode())
+
+    def _handle(self, method: str, body: str):
+        stub = self.stub
+        with stub.lock:
+            stub.requests += 1
+        delay = stub.latency + random.uniform(0, stub.jitter)
+        if random.random() < stub.stall_rate:
+            delay += stub.stall
+        if delay:
+            time.sleep(delay)
+        if random.random() < stub.error_rate:
+            with stub.lock:
+                stub.errors += 1
+            return self._reply(503, "injected upstream error")
+        host = (self.headers.get("Host") or "").split(":")[0]
+        url = urlsplit(self.path)
+        for route_host, route_method, pattern, fixture in ROUTES:
+            match = pattern.match(url.path)
+            if route_method != method or not match:
+                continue
+            if route_host is not None and route_host != host:
+                continue
+            if fixture is None:
+                fixture = (
+                    "fojik_search.html" if "s=" in url.query else "fojik_home.html"
+                )
+            token_id = match.groupdict().get("id") or self._token_id(body)
+            return self._reply(200, self.fixtures[fixture].replace("{id}", token_id))
+        self._reply(404, "not found")
+
+    @staticmethod
+    def _token_id(body: str) -> str:
+        """Recover the identifier from the first posted ``<prefix>.<id>`` token."""
+        try:
+            values = list(json.loads(body).values())
+        except ValueError:
+            values = [v[0] for v in parse_qs(body).values()]
+        for value in values:
+            if "." in value:
+                return value.split(".", 1)[1]
+        return "unknown"
+
+    def _reply(self, status: int, text: str):
+        payload = text.encode()
+        self.send_response(status)
+        content_type = "text/html" if text.lstrip().startswith("<") else "text/plain"
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        if not self.stub.chunked:
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            try:
+                self.wfile.write(payload)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            return
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for start in range(0, len(payload), CHUNK_SIZE):
+                chunk = payload[start : start + CHUNK_SIZE]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start(port: int = 0, **options) -> tuple[ThreadingHTTPServer, StubConfig]:
+    """Start the stub in a daemon thread; returns the server and its live config."""
+    stub = StubConfig(**options)
+    handler = type(
+        "BoundStubHandler",
+        (StubHandler,),
+        {
+            "stub": stub,
+            "fixtures": {p.name: p.read_text() for p in FIXTURES.iterdir()},
+        },
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stub
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="extra random seconds"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--stall-rate", type=float, default=0.0, help="share of requests that stall"
+    )
+    parser.add_argument("--stall", type=float, default=5.0, help="seconds per stall")
+    parser.add_argument("--chunked", action="store_true", help="send chunked bodies")
+    args = parser.parse_args()
+    server, _ = start(
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        stall_rate=args.stall_rate,
+        stall=args.stall,
+        chunked=args.chunked,
+    )
+    print(f"stub upstream on http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Parity of the configured parser backend with full html.parser trees.
+
+Runs every parse step of ``app.services.scraper`` and ``app.colab_version``
+on the pages in ``benchmarks/fixtures`` and checks that the configured
+backend, its SoupStrainers and the TokenScanner give the same output as a
+full ``html.parser`` tree.
+
+    python -m pytest benchmarks
+"""
+
+import re
+from pathlib import Path
+import pytest
+from app import colab_version as colab
+from app.services import scraper
+from app.services.parsing import TokenScanner
+from benchmarks.parsers import HOP_INPUTS, full_html_parser, soup_hidden_inputs
+
+FIXTURES = Path(__file__).parent / "fixtures"
+LISTING_PAGES = ("fojik_home.html", "fojik_search.html")
+HOP_PAGES = {
+    "movie_page.html": ("FU", "FN"),
+    "technews24_blog.html": ("FU2",),
+    "intermediate.html": ("FU5",),
+    "sharelink_dld.html": ("FU7",),
+}
+JS_PAGES = {
+    "freethemesy_dld.html": {
+        "sss": scraper.FREETHEMESY_SSS_VAR,
+        "fetch": scraper.FREETHEMESY_FETCH_LIST,
+    },
+    "sharelink_blog.html": {"sss": scraper.SSS_VAR, "v": scraper.SHARELINK_V_VAR},
+}
+
+
+def fixture(name: str) -> str:
+    return (FIXTURES / name).read_text().replace("{id}", "fixture")
+
+
+def scan(text: str, chunk_size: int, **kwargs) -> dict[str, str]:
+    scanner = TokenScanner(**kwargs)
+    for start in range(0, len(text), chunk_size):
+        scanner.feed(text[start : start + chunk_size])
+    return scanner.found
+
+
+@pytest.mark.parametrize("name", LISTING_PAGES)
+def test_movie_items(name):
+    html = fixture(name)
+    with full_html_parser():
+        expected = scraper._parse_movie_items(html)
+    assert expected
+    assert scraper._parse_movie_items(html) == expected
+    assert colab.parse_movie_items(html) == expected
+
+
+@pytest.mark.parametrize("name", HOP_PAGES)
+@pytest.mark.parametrize("chunk_size", (1, 64, 4096))
+def test_hidden_inputs(name, chunk_size):
+    html = fixture(name)
+    expected = soup_hidden_inputs(html)
+    assert set(expected) == set(HOP_PAGES[name])
+    assert scan(html, chunk_size, inputs=HOP_INPUTS) == expected
+    assert colab.hidden_inputs(html, *HOP_INPUTS) == expected
+
+
+@pytest.mark.parametrize("name", JS_PAGES)
+@pytest.mark.parametrize("chunk_size", (1, 64, 4096))
+def test_js_variables(name, chunk_size):
+    text = fixture(name)
+    patterns = JS_PAGES[name]
+    expected = {key: re.search(p, text).group(1) for key, p in patterns.items()}
+    assert scan(text, chunk_size, patterns=patterns) == expected
+
+
+def test_link_groups(monkeypatch):
+    html = fixture("final_links.html")
+    with full_html_parser():
+        expected = scraper.extract_all_links(html)
+    assert expected
+    assert scraper.extract_all_links(html) == expected
+    assert colab.extract_all_links(html) == expected
+    monkeypatch.setattr(colab, "PARSER", "html.parser")
+    assert colab.extract_all_links(html) == expected